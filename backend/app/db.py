@@ -1,22 +1,130 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.orm import declarative_base
+from contextlib import asynccontextmanager, nullcontext
+import asyncio
 import os
 
+import orjson
+
+from app.models import Base
+
 # Database URL - SQLite for development
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./leads.db")
+IS_SQLITE = SQLALCHEMY_DATABASE_URL.startswith("sqlite")
+
+# Create missing tables on startup; set to 0 where the schema is managed externally
+DB_AUTO_CREATE = os.getenv("DB_AUTO_CREATE", "1") == "1"
+
+# Async drivers for the sync URL schemes we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+def _async_url(url: str) -> str:
+    """Map a sync database URL onto its async driver"""
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.get_backend_name(), parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = _async_url(SQLALCHEMY_DATABASE_URL)
+
+# Connection pool settings (ignored for SQLite, which is file-local)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+
+def _json_serializer(obj) -> str:
+    """Encode JSON columns with orjson"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+# JSON column (de)serialization shared by every engine
+json_options = {
+    "json_serializer": _json_serializer,
+    "json_deserializer": orjson.loads,
+}
+
+if IS_SQLITE:
+    engine_options = {
+        "connect_args": {"check_same_thread": False},
+        "pool_pre_ping": True,
+        **json_options,
+    }
+else:
+    engine_options = {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+        **json_options,
+    }
 
 # Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, 
-    connect_args={"check_same_thread": False} if "sqlite" in SQLALCHEMY_DATABASE_URL else {}
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options)
+
+# Async engine used by the async route handlers
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options)
+
+# SQLite tuning applied to every new connection: WAL lets readers run
+# alongside the writer, busy_timeout turns SQLITE_BUSY into a short wait
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-32000",
+    "PRAGMA temp_store=MEMORY",
 )
 
-# Session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to a freshly opened connection"""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+def _disable_driver_transactions(dbapi_connection, connection_record):
+    """Stop the sqlite3 driver from issuing its own BEGIN/COMMIT.
+
+    The driver defers BEGIN until the first DML statement, so a leading
+    SAVEPOINT would open (and its RELEASE commit) a transaction of its own.
+    """
+    dbapi_connection.isolation_level = None
+
+def _begin_immediate(conn):
+    """Start write transactions holding SQLite's write lock"""
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+# SQLite allows a single writer at a time, so writes go through a dedicated
+# one-connection engine and queue on an asyncio.Lock instead of retrying on
+# SQLITE_BUSY. Other databases write through the shared async pool.
+if IS_SQLITE:
+    write_engine = create_async_engine(
+        ASYNC_DATABASE_URL, **engine_options, pool_size=1, max_overflow=0
+    )
+    write_lock = asyncio.Lock()
+
+    event.listen(engine, "connect", _set_sqlite_pragmas)
+    event.listen(async_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    event.listen(write_engine.sync_engine, "connect", _set_sqlite_pragmas)
+    # SAVEPOINTs (begin_nested) on the write engine need explicit BEGINs
+    event.listen(write_engine.sync_engine, "connect", _disable_driver_transactions)
+    event.listen(write_engine.sync_engine, "begin", _begin_immediate)
+else:
+    write_engine = async_engine
+    write_lock = nullcontext()
 
-# Base class for models
-Base = declarative_base()
+# Session factories
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+WriteSessionLocal = async_sessionmaker(
+    write_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
 
 def get_db():
     """Dependency to get database session"""
@@ -26,7 +134,18 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@asynccontextmanager
+async def write_session():
+    """Open a session for writes, serialized through the write engine"""
+    async with write_lock:
+        async with WriteSessionLocal() as db:
+            yield db
+
 def create_tables():
     """Create all tables"""
-    from app.models import Base
     Base.metadata.create_all(bind=engine)
@@ -1,19 +1,39 @@
 from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from app.db import create_tables
+from app.db import DB_AUTO_CREATE, create_tables
 from app.routers import leads, grok, evals, meetings
+from app.services.grok_client import GrokError, get_grok_client
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    create_tables()
+    if DB_AUTO_CREATE:
+        create_tables()
+    
+    # One Grok client per process so its gRPC channel is reused across requests
+    try:
+        app.state.grok = get_grok_client()
+    except GrokError:
+        # Missing API key; Grok routes report this per request
+        app.state.grok = None
+    
     yield
-    # Shutdown (cleanup if needed)
+    
+    # Shutdown
+    if app.state.grok is not None:
+        await app.state.grok.close()
+        get_grok_client.cache_clear()
 
 
-app = FastAPI(title="AI SDR API", version="1.0.0", lifespan=lifespan)
+app = FastAPI(
+    title="AI SDR API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
+)
 
 # Health check endpoint
 @app.get("/health")
@@ -29,10 +49,7 @@ app.include_router(meetings.router)
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000", 
-        "http://localhost:5173"
-    ],
+    allow_origin_regex=r"^http://localhost:(3000|5173)$",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, ForeignKey, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, ForeignKey, Float, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base, relationship
 from sqlalchemy.sql import func
 from datetime import datetime
 
+# JSON payload column: binary JSONB on Postgres, plain JSON elsewhere
+JSONPayload = JSON().with_variant(JSONB(), "postgresql")
+
 Base = declarative_base()
 
 class Lead(Base):
@@ -33,11 +37,15 @@ class Activity(Base):
     lead_id = Column(Integer, ForeignKey("leads.id"), nullable=True)
     activity_type = Column(String, nullable=False)  # created, qualified, scored, contacted, etc.
     description = Column(Text, nullable=False)
-    data = Column(JSON, nullable=True)  # Store additional data like scores, AI responses
+    data = Column(JSONPayload, nullable=True)  # Store additional data like scores, AI responses
     created_at = Column(DateTime, default=func.now())
     
     # Relationships
     lead = relationship("Lead", back_populates="activities")
+    
+    __table_args__ = (
+        Index("ix_activities_lead_created", "lead_id", "created_at"),
+    )
 
 class ScoringConfig(Base):
     __tablename__ = "scoring_configs"
@@ -84,7 +92,11 @@ class EvaluationRun(Base):
     schema_compliance_rate = Column(Float, nullable=False)
     total_schema_errors = Column(Integer, nullable=False)
     avg_prompt_completeness = Column(Float, nullable=False)
-    results = Column(JSON, nullable=False)  # Detailed results - stores the results list
+    results = Column(JSONPayload, nullable=False)  # Detailed results - stores the results list
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index("ix_eval_created_at", "created_at"),
+    )
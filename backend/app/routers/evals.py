@@ -6,47 +6,85 @@ import asyncio
 from pathlib import Path
 from datetime import datetime
 from typing import List, Optional
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_db
+from app.db import get_async_db, write_session
 from app.models import EvaluationRun as EvaluationRunModel
-from app.schemas import EvaluationRunRequest, EvaluationRunResponse
+from app.schemas import EvaluationRunRequest, EvaluationRunResponse, EvaluationRunSummary
 
-# Add evals to path
 backend_dir = Path(__file__).parent.parent.parent
-sys.path.insert(0, str(backend_dir / "evals"))
 
-try:
-    import run as eval_runner
-except ImportError:
-    eval_runner = None
+# Evaluation harness, imported on first use so workers that never run evals
+# don't pay for loading it
+_eval_runner = None
+
+
+def _get_runner():
+    """Import the evals runner on first call; None if it isn't available"""
+    global _eval_runner
+    if _eval_runner is None:
+        evals_dir = str(backend_dir / "evals")
+        if evals_dir not in sys.path:
+            sys.path.insert(0, evals_dir)
+        try:
+            import run as eval_runner
+        except ImportError:
+            return None
+        _eval_runner = eval_runner
+    return _eval_runner
 
 router = APIRouter(prefix="/api/evals", tags=["evaluations"])
 
+# Columns read by EvaluationRunSummary; the list view never touches the
+# per-test results blob
+SUMMARY_COLUMNS = (
+    EvaluationRunModel.id,
+    EvaluationRunModel.timestamp,
+    EvaluationRunModel.status,
+    EvaluationRunModel.total_tests,
+    EvaluationRunModel.passed_tests,
+    EvaluationRunModel.failed_tests,
+    EvaluationRunModel.error_tests,
+    EvaluationRunModel.pass_rate,
+    EvaluationRunModel.verdict_accuracy,
+    EvaluationRunModel.confidence_accuracy,
+    EvaluationRunModel.schema_compliance_rate,
+    EvaluationRunModel.total_schema_errors,
+    EvaluationRunModel.avg_prompt_completeness,
+)
+
+# Columns read by EvaluationRunResponse; skips error_message and audit timestamps
+RESPONSE_COLUMNS = load_only(*SUMMARY_COLUMNS, EvaluationRunModel.results)
+
+# Completed runs never change, so their responses are kept briefly by id
+_EVAL_CACHE: TTLCache = TTLCache(maxsize=128, ttl=300)
+
 
 @router.post("/run", response_model=EvaluationRunResponse)
 async def run_evaluation(
-    request: EvaluationRunRequest = EvaluationRunRequest(),
-    db: Session = Depends(get_db)
+    request: EvaluationRunRequest = EvaluationRunRequest()
 ):
     """
     Run evaluation framework and store results in database
     
     Args:
         request: Optional evaluation request with filters
-        db: Database session
         
     Returns:
         Evaluation results with database ID
     """
+    eval_runner = _get_runner()
     if eval_runner is None:
         raise HTTPException(
             status_code=500, 
             detail="Evaluation framework not available"
         )
     
-    # Create initial evaluation record
+    # Evaluation record, filled in and written once the run finishes
     eval_record = EvaluationRunModel(
         status="running",
         total_tests=0,
@@ -62,25 +100,28 @@ async def run_evaluation(
         results={}
     )
     
-    db.add(eval_record)
-    db.commit()
-    db.refresh(eval_record)
+    # Only pay for the extra write when a client wants to poll the run
+    if request.track_progress:
+        async with write_session() as write_db:
+            write_db.add(eval_record)
+            await write_db.commit()
+            await write_db.refresh(eval_record)
     
     try:
         # Run evaluations
         if request.include_leads:
             # Filter fixture leads by names
+            wanted_names = set(request.include_leads)
             fixture_leads = eval_runner.load_fixture_leads()
             filtered_leads = [
                 lead for lead in fixture_leads 
-                if lead["name"] in request.include_leads
+                if lead["name"] in wanted_names
             ]
             
-            # Run filtered evaluations
-            results = []
-            for lead in filtered_leads:
-                result = await eval_runner.run_evaluation(lead)
-                results.append(result)
+            # Run filtered evaluations concurrently; the Grok client caps
+            # requests in flight (GROK_MAX_CONCURRENCY). Failures come back as
+            # error results rather than raising.
+            results = await eval_runner.evaluate_leads(filtered_leads)
             
             # Generate report from filtered results
             report = eval_runner.generate_enhanced_report(results)
@@ -102,8 +143,11 @@ async def run_evaluation(
         eval_record.avg_prompt_completeness = report["prompt_validation_summary"]["avg_completeness_score"]
         eval_record.results = report["results"]  # This is a list of result dictionaries
         
-        db.commit()
-        db.refresh(eval_record)
+        async with write_session() as write_db:
+            write_db.add(eval_record)
+            await write_db.commit()
+            await write_db.refresh(eval_record)
+        _EVAL_CACHE.pop(eval_record.id, None)
         
         # Return formatted response
         return EvaluationRunResponse(
@@ -127,7 +171,9 @@ async def run_evaluation(
         # Update record with error
         eval_record.status = "failed"
         eval_record.error_message = str(e)
-        db.commit()
+        async with write_session() as write_db:
+            write_db.add(eval_record)
+            await write_db.commit()
         
         raise HTTPException(
             status_code=500,
@@ -136,7 +182,7 @@ async def run_evaluation(
 
 
 @router.get("/{evaluation_id}", response_model=EvaluationRunResponse)
-def get_evaluation(evaluation_id: int, db: Session = Depends(get_db)):
+async def get_evaluation(evaluation_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get specific evaluation results by ID
     
@@ -147,68 +193,49 @@ def get_evaluation(evaluation_id: int, db: Session = Depends(get_db)):
     Returns:
         Evaluation results
     """
-    eval_record = db.query(EvaluationRunModel).filter(
-        EvaluationRunModel.id == evaluation_id
-    ).first()
+    cached = _EVAL_CACHE.get(evaluation_id)
+    if cached is not None:
+        return cached
+    
+    result = await db.execute(
+        select(EvaluationRunModel)
+        .options(RESPONSE_COLUMNS)
+        .where(EvaluationRunModel.id == evaluation_id)
+    )
+    eval_record = result.scalar_one_or_none()
     
     if not eval_record:
         raise HTTPException(status_code=404, detail="Evaluation not found")
     
-    return EvaluationRunResponse(
-        evaluation_id=eval_record.id,
-        timestamp=eval_record.timestamp.isoformat(),
-        status=eval_record.status,
-        total_tests=eval_record.total_tests,
-        passed_tests=eval_record.passed_tests,
-        failed_tests=eval_record.failed_tests,
-        error_tests=eval_record.error_tests,
-        pass_rate=eval_record.pass_rate,
-        verdict_accuracy=eval_record.verdict_accuracy,
-        confidence_accuracy=eval_record.confidence_accuracy,
-        schema_compliance_rate=eval_record.schema_compliance_rate,
-        total_schema_errors=eval_record.total_schema_errors,
-        avg_prompt_completeness=eval_record.avg_prompt_completeness,
-        results=eval_record.results
-    )
+    response = EvaluationRunResponse.model_validate(eval_record)
+    if response.status == "completed":
+        _EVAL_CACHE[evaluation_id] = response
+    return response
 
 
-@router.get("/", response_model=List[EvaluationRunResponse])
-def list_evaluations(
+@router.get("/", response_model=List[EvaluationRunSummary])
+async def list_evaluations(
     limit: int = 10,
     offset: int = 0,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List evaluation runs with pagination
     
+    Per-test results are omitted; fetch a single evaluation for those.
+    
     Args:
         limit: Maximum number of results
         offset: Number of results to skip
         db: Database session
         
     Returns:
-        List of evaluation runs
+        List of evaluation run summaries
     """
-    eval_records = db.query(EvaluationRunModel).order_by(
-        EvaluationRunModel.created_at.desc()
-    ).offset(offset).limit(limit).all()
-    
-    return [
-        EvaluationRunResponse(
-            evaluation_id=record.id,
-            timestamp=record.timestamp.isoformat(),
-            status=record.status,
-            total_tests=record.total_tests,
-            passed_tests=record.passed_tests,
-            failed_tests=record.failed_tests,
-            error_tests=record.error_tests,
-            pass_rate=record.pass_rate,
-            verdict_accuracy=record.verdict_accuracy,
-            confidence_accuracy=record.confidence_accuracy,
-            schema_compliance_rate=record.schema_compliance_rate,
-            total_schema_errors=record.total_schema_errors,
-            avg_prompt_completeness=record.avg_prompt_completeness,
-            results=record.results
-        )
-        for record in eval_records
-    ]
+    result = await db.execute(
+        select(*SUMMARY_COLUMNS)
+        .order_by(EvaluationRunModel.created_at.desc())
+        .offset(offset)
+        .limit(limit)
+    )
+    return result.all()
@@ -5,18 +5,38 @@ Handles lead qualification and outreach generation using Grok AI.
 """
 
 from typing import Dict, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
-from app.db import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Body
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db, write_session
 from app.models import Lead, Activity
 from app.services.grok_client import GrokClient, GrokError
 import asyncio
 
 router = APIRouter(prefix="/api/leads", tags=["grok"])
 
+# Pipeline stages in order, and each stage's position for O(1) lookup
+STAGE_HIERARCHY = ("New", "Qualified", "Contacted", "Meeting Scheduled", "Won", "Lost")
+_STAGE_INDEX = {stage: index for index, stage in enumerate(STAGE_HIERARCHY)}
+
+
+async def get_grok(request: Request) -> GrokClient:
+    """Dependency returning the shared Grok client created at startup"""
+    grok_client = getattr(request.app.state, "grok", None)
+    if grok_client is None:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Grok client unavailable: XAI_API_KEY environment variable is required"
+        )
+    return grok_client
+
 
 @router.post("/{lead_id}/qualify")
-async def qualify_lead(lead_id: int, db: Session = Depends(get_db)):
+async def qualify_lead(
+    lead_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    grok_client: GrokClient = Depends(get_grok)
+):
     """
     Qualify a lead using Grok AI
     
@@ -25,7 +45,8 @@ async def qualify_lead(lead_id: int, db: Session = Depends(get_db)):
     """
     
     # Get the lead
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    result = await db.execute(select(Lead).where(Lead.id == lead_id))
+    lead = result.scalar_one_or_none()
     if not lead:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -33,9 +54,6 @@ async def qualify_lead(lead_id: int, db: Session = Depends(get_db)):
         )
     
     try:
-        # Initialize Grok client
-        grok_client = GrokClient()
-        
         # Prepare lead data for Grok
         lead_data = {
             "name": lead.name,
@@ -51,11 +69,11 @@ async def qualify_lead(lead_id: int, db: Session = Depends(get_db)):
         qualification_result = await grok_client.qualify_lead(lead_data)
         
         # Create activity log for qualification
-        activity = Activity(
-            lead_id=lead.id,
-            activity_type="grok_qualification",
-            description=f"Lead qualified by Grok: {qualification_result.verdict} ({qualification_result.confidence}% confidence)",
-            data={
+        activity = {
+            "lead_id": lead.id,
+            "activity_type": "grok_qualification",
+            "description": f"Lead qualified by Grok: {qualification_result.verdict} ({qualification_result.confidence}% confidence)",
+            "data": {
                 "verdict": qualification_result.verdict,
                 "confidence": qualification_result.confidence,
                 "reasoning": qualification_result.reasoning,
@@ -63,33 +81,40 @@ async def qualify_lead(lead_id: int, db: Session = Depends(get_db)):
                 "grok_model": grok_client.model,
                 "qualification_timestamp": "auto"
             }
-        )
-        db.add(activity)
+        }
+        activities = [activity]
+        new_stage = None
         
         # Update lead stage if qualification verdict is positive and lead isn't already advanced
-        stage_stages_hierarchy = ["New", "Qualified", "Contacted", "Meeting Scheduled", "Won", "Lost"]
-        current_stage_index = stage_stages_hierarchy.index(lead.stage) if lead.stage in stage_stages_hierarchy else 0
+        current_stage_index = _STAGE_INDEX.get(lead.stage, 0)
         
         if qualification_result.verdict == "qualified" and current_stage_index < 1:  # Only advance if below "Qualified"
             old_stage = lead.stage
-            lead.stage = "Qualified"
+            new_stage = "Qualified"
             
             # Create stage change activity
-            stage_activity = Activity(
-                lead_id=lead.id,
-                activity_type="stage_change",
-                description=f"Stage updated: {old_stage} → Qualified (triggered by Grok qualification)",
-                data={
+            stage_activity = {
+                "lead_id": lead.id,
+                "activity_type": "stage_change",
+                "description": f"Stage updated: {old_stage} → Qualified (triggered by Grok qualification)",
+                "data": {
                     "old_stage": old_stage,
                     "new_stage": "Qualified",
                     "trigger": "grok_qualification",
                     "verdict": qualification_result.verdict,
                     "confidence": qualification_result.confidence
                 }
-            )
-            db.add(stage_activity)
+            }
+            activities.append(stage_activity)
         
-        db.commit()
+        # Activity rows go out as one executemany INSERT in the same transaction
+        # as the stage update
+        async with write_session() as write_db, write_db.begin():
+            await write_db.execute(insert(Activity), activities)
+            if new_stage:
+                await write_db.execute(
+                    update(Lead).where(Lead.id == lead.id).values(stage=new_stage)
+                )
         
         return {
             "message": "Lead qualified successfully",
@@ -108,7 +133,7 @@ async def qualify_lead(lead_id: int, db: Session = Depends(get_db)):
         )
     except Exception as e:
         # Handle unexpected errors
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Qualification failed: {str(e)}"
@@ -119,7 +144,8 @@ async def qualify_lead(lead_id: int, db: Session = Depends(get_db)):
 async def generate_outreach(
     lead_id: int, 
     request_data: Optional[Dict[str, Any]] = Body(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db),
+    grok_client: GrokClient = Depends(get_grok)
 ):
     """
     Generate personalized outreach message using Grok AI
@@ -132,7 +158,8 @@ async def generate_outreach(
     """
     
     # Get the lead
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    result = await db.execute(select(Lead).where(Lead.id == lead_id))
+    lead = result.scalar_one_or_none()
     if not lead:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -140,9 +167,6 @@ async def generate_outreach(
         )
     
     try:
-        # Initialize Grok client
-        grok_client = GrokClient()
-        
         # Prepare lead data for Grok
         lead_data = {
             "name": lead.name,
@@ -176,8 +200,9 @@ async def generate_outreach(
                 "generation_timestamp": "auto"
             }
         )
-        db.add(activity)
-        db.commit()
+        async with write_session() as write_db:
+            write_db.add(activity)
+            await write_db.commit()
         
         return {
             "message": "Outreach generated successfully",
@@ -195,7 +220,7 @@ async def generate_outreach(
         )
     except Exception as e:
         # Handle unexpected errors
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Outreach generation failed: {str(e)}"
@@ -1,12 +1,15 @@
 from typing import List, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import and_, exists, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 import csv
 import io
 from pydantic import ValidationError
 
-from app.db import get_db
+from app.db import get_async_db, write_session
 from app.models import Lead, Activity
 from app.schemas import LeadCreate, Lead as LeadSchema
 from app.seed_data import seed_sample_leads
@@ -15,14 +18,195 @@ from typing import Optional, List
 
 router = APIRouter(prefix="/api/leads", tags=["leads"])
 
+# Initialize scoring service (stateless after construction)
+scoring_service = ScoringService()
+
+# Leads per bulk INSERT during CSV import
+IMPORT_BATCH_SIZE = 1000
+
+# Columns every imported CSV must have
+REQUIRED_HEADERS = frozenset({'name', 'email'})
+
+
+# Lead fields read from an imported CSV row
+LEAD_FIELDS = ('name', 'email', 'company', 'title', 'phone', 'linkedin_url', 'notes')
+
+
+def _clean_row(row: List[str], field_indexes: List[tuple]) -> Dict[str, Optional[str]]:
+    """
+    Read lead fields from a CSV row by column position.
+    
+    Values are stripped; blank, missing or absent-column fields become None.
+    """
+    width = len(row)
+    return {
+        field: (row[index].strip() or None) if index is not None and index < width else None
+        for field, index in field_indexes
+    }
+
+# LeadCreate's compiled validator, called directly for each CSV row
+_lead_validator = LeadCreate.__pydantic_validator__
+
+# Columns serialized by the Lead response schema
+LEAD_COLUMNS = (
+    Lead.id,
+    Lead.name,
+    Lead.email,
+    Lead.company,
+    Lead.title,
+    Lead.stage,
+    Lead.score,
+    Lead.phone,
+    Lead.linkedin_url,
+    Lead.notes,
+    Lead.created_at,
+    Lead.updated_at,
+    Lead.company_profile_id,
+)
+
+
+def _iter_lead_batches(
+    csv_reader, field_indexes: List[tuple], errors: List[tuple]
+):
+    """
+    Validate CSV data rows and yield valid leads in batches of (row_num, lead_data).
+    
+    Blocking (file reads, csv parsing, validation), so the import drives it from
+    a worker thread. Invalid rows and repeated emails are appended to errors as
+    (row_num, message).
+    """
+    batch = []
+    seen_emails = set()
+    
+    # Blank lines are skipped without counting, as DictReader did
+    rows = (row for row in csv_reader if row)
+    for row_num, row in enumerate(rows, start=2):  # Start at 2 (after header)
+        try:
+            # Clean and validate row data
+            lead_data = _clean_row(row, field_indexes)
+            
+            # Skip empty rows
+            if not lead_data['name'] and not lead_data['email']:
+                continue
+            
+            # Validate required fields
+            if not lead_data['name'] or not lead_data['email']:
+                if not lead_data['name']:
+                    error_msg = f"Row {row_num}: Missing required field 'name'"
+                else:
+                    error_msg = f"Row {row_num}: Missing required field 'email'"
+                errors.append((row_num, error_msg))
+                continue
+            
+            # Validate with Pydantic
+            validated_lead = _lead_validator.validate_python(lead_data)
+            
+        except ValidationError as e:
+            errors.append((row_num, f"Row {row_num}: Validation error - {str(e)}"))
+            continue
+            
+        except Exception as e:
+            errors.append((row_num, f"Row {row_num}: Unexpected error - {str(e)}"))
+            continue
+        
+        # Repeats within the file never reach the database
+        if validated_lead.email in seen_emails:
+            errors.append((row_num, f"Row {row_num}: Email {validated_lead.email} already exists"))
+            continue
+        seen_emails.add(validated_lead.email)
+        
+        batch.append((row_num, validated_lead.__dict__ | {"stage": "New"}))
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    
+    if batch:
+        yield batch
+
+async def _insert_lead_batch(
+    db: AsyncSession, batch: List[tuple], filename: Optional[str], errors: List[tuple]
+) -> int:
+    """
+    Bulk insert a batch of (row_num, lead_data) pairs and their import activities.
+    
+    Runs inside a SAVEPOINT of the caller's transaction. If the batch fails the
+    savepoint is rolled back and the batch split in half until the bad rows are
+    isolated; their errors are appended to errors as (row_num, message).
+    Returns the number of leads inserted.
+    """
+    try:
+        async with db.begin_nested():
+            result = await db.execute(
+                insert(Lead).returning(Lead.id, sort_by_parameter_order=True),
+                [lead_data for _, lead_data in batch]
+            )
+            lead_ids = result.scalars().all()
+            
+            await db.execute(insert(Activity), [
+                {
+                    "lead_id": lead_id,
+                    "activity_type": "imported",
+                    "description": "Lead imported from CSV",
+                    "data": {"source": "csv_import", "file": filename, "row": row_num}
+                }
+                for lead_id, (row_num, _) in zip(lead_ids, batch)
+            ])
+        return len(lead_ids)
+        
+    except Exception as e:
+        if len(batch) > 1:
+            middle = len(batch) // 2
+            return (
+                await _insert_lead_batch(db, batch[:middle], filename, errors)
+                + await _insert_lead_batch(db, batch[middle:], filename, errors)
+            )
+        
+        row_num, lead_data = batch[0]
+        if isinstance(e, IntegrityError):
+            if "UNIQUE constraint failed: leads.email" in str(e):
+                error_msg = f"Row {row_num}: Email {lead_data['email']} already exists"
+            else:
+                error_msg = f"Row {row_num}: Database error - {str(e)}"
+        else:
+            error_msg = f"Row {row_num}: Unexpected error - {str(e)}"
+        errors.append((row_num, error_msg))
+        return 0
+
+async def _flush_lead_batch(
+    db: AsyncSession, batch: List[tuple], filename: Optional[str], errors: List[tuple]
+) -> int:
+    """
+    Drop rows whose email is already stored, then bulk insert the rest.
+    
+    Known duplicates are reported without going through a failed INSERT.
+    Returns the number of leads inserted.
+    """
+    result = await db.execute(
+        select(Lead.email).where(Lead.email.in_([lead_data["email"] for _, lead_data in batch]))
+    )
+    existing_emails = set(result.scalars())
+    
+    new_rows = []
+    for row_num, lead_data in batch:
+        if lead_data["email"] in existing_emails:
+            errors.append((row_num, f"Row {row_num}: Email {lead_data['email']} already exists"))
+        else:
+            new_rows.append((row_num, lead_data))
+    
+    if not new_rows:
+        return 0
+    return await _insert_lead_batch(db, new_rows, filename, errors)
+
 @router.get("/", response_model=List[LeadSchema])
-def get_leads(db: Session = Depends(get_db)):
+async def get_leads(db: AsyncSession = Depends(get_async_db)):
     """Get all leads"""
-    leads = db.query(Lead).all()
-    return leads
+    # Plain column rows skip ORM hydration, and returning the response directly
+    # skips re-validating every row against LeadSchema (data is validated on write)
+    result = await db.execute(select(*LEAD_COLUMNS))
+    return ORJSONResponse([row._asdict() for row in result])
 
 @router.post("/", response_model=LeadSchema, status_code=status.HTTP_201_CREATED)
-def create_lead(lead: LeadCreate, db: Session = Depends(get_db)):
+async def create_lead(lead: LeadCreate):
     """Create a new lead"""
     try:
         # Create new lead
@@ -37,24 +221,24 @@ def create_lead(lead: LeadCreate, db: Session = Depends(get_db)):
             stage="New"  # Default stage
         )
         
-        db.add(db_lead)
-        db.commit()
-        db.refresh(db_lead)
-        
-        # Create activity for lead creation
-        activity = Activity(
-            lead_id=db_lead.id,
-            activity_type="created",
-            description=f"Lead {db_lead.name} created",
-            data={"source": "api", "initial_stage": "New"}
-        )
-        db.add(activity)
-        db.commit()
+        async with write_session() as db:
+            db.add(db_lead)
+            await db.flush()  # INSERT ... RETURNING fills id and timestamps
+            
+            # Create activity for lead creation
+            activity = Activity(
+                lead_id=db_lead.id,
+                activity_type="created",
+                description=f"Lead {db_lead.name} created",
+                data={"source": "api", "initial_stage": "New"}
+            )
+            db.add(activity)
+            await db.commit()
         
         return db_lead
         
     except IntegrityError as e:
-        db.rollback()
+        # The write session rolls back on exit
         if "UNIQUE constraint failed: leads.email" in str(e):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -66,9 +250,8 @@ def create_lead(lead: LeadCreate, db: Session = Depends(get_db)):
         )
 
 @router.post("/import")
-def import_leads_csv(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+async def import_leads_csv(
+    file: UploadFile = File(...)
 ) -> Dict[str, Any]:
     """Import leads from CSV file"""
     
@@ -81,109 +264,52 @@ def import_leads_csv(
             )
     
     try:
-        # Read file content
-        content = file.file.read().decode('utf-8')
-        if not content.strip():
+        # Parse CSV straight off the upload so rows are decoded as they are read
+        # instead of holding the whole file in memory
+        text_stream = io.TextIOWrapper(file.file, encoding='utf-8', newline='')
+        csv_reader = csv.reader(text_stream)
+        
+        # Reading the spooled upload blocks, so it happens off the event loop.
+        # Blank lines before the header are skipped, as DictReader did
+        header_rows = (row for row in csv_reader if row)
+        fieldnames = await run_in_threadpool(next, header_rows, [])
+        if not any(name.strip() for name in fieldnames):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="File is empty"
             )
         
-        # Parse CSV
-        csv_reader = csv.DictReader(io.StringIO(content))
-        
         # Validate required headers
-        required_headers = {'name', 'email'}
-        fieldnames = csv_reader.fieldnames or []
-        if not required_headers.issubset(set(fieldnames)):
+        if not REQUIRED_HEADERS.issubset(fieldnames):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"CSV must contain required headers: {', '.join(required_headers)}"
+                detail=f"CSV must contain required headers: {', '.join(REQUIRED_HEADERS)}"
             )
         
+        # Rows are plain lists; look fields up by column position
+        column_index = {name: index for index, name in enumerate(fieldnames)}
+        field_indexes = [(field, column_index.get(field)) for field in LEAD_FIELDS]
+        
         imported_count = 0
-        failed_count = 0
-        errors = []
+        errors = []  # (row_num, message)
         
-        # Process each row
-        for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (after header)
-            try:
-                # Clean and validate row data
-                lead_data = {
-                    'name': row.get('name', '').strip(),
-                    'email': row.get('email', '').strip(),
-                    'company': row.get('company', '').strip() or None,
-                    'title': row.get('title', '').strip() or None,
-                    'phone': row.get('phone', '').strip() or None,
-                    'linkedin_url': row.get('linkedin_url', '').strip() or None,
-                    'notes': row.get('notes', '').strip() or None,
-                }
-                
-                # Skip empty rows
-                if not lead_data['name'] and not lead_data['email']:
-                    continue
-                
-                # Validate required fields
-                if not lead_data['name'] or not lead_data['email']:
-                    failed_count += 1
-                    if not lead_data['name']:
-                        error_msg = f"Row {row_num}: Missing required field 'name'"
-                    else:
-                        error_msg = f"Row {row_num}: Missing required field 'email'"
-                    errors.append(error_msg)
-                    continue
-                
-                # Validate with Pydantic
-                validated_lead = LeadCreate(**lead_data)
-                
-                # Create lead
-                db_lead = Lead(
-                    name=validated_lead.name,
-                    email=validated_lead.email,
-                    company=validated_lead.company,
-                    title=validated_lead.title,
-                    phone=validated_lead.phone,
-                    linkedin_url=validated_lead.linkedin_url,
-                    notes=validated_lead.notes,
-                    stage="New"
-                )
-                
-                db.add(db_lead)
-                db.commit()
-                db.refresh(db_lead)
-                
-                # Create activity
-                activity = Activity(
-                    lead_id=db_lead.id,
-                    activity_type="imported",
-                    description=f"Lead imported from CSV",
-                    data={"source": "csv_import", "file": file.filename, "row": row_num}
-                )
-                db.add(activity)
-                db.commit()
-                
-                imported_count += 1
-                
-            except ValidationError as e:
-                failed_count += 1
-                error_msg = f"Row {row_num}: Validation error - {str(e)}"
-                errors.append(error_msg)
-                db.rollback()
-                
-            except IntegrityError as e:
-                failed_count += 1
-                if "UNIQUE constraint failed: leads.email" in str(e):
-                    error_msg = f"Row {row_num}: Email {lead_data.get('email')} already exists"
-                else:
-                    error_msg = f"Row {row_num}: Database error - {str(e)}"
-                errors.append(error_msg)
-                db.rollback()
-                
-            except Exception as e:
-                failed_count += 1
-                error_msg = f"Row {row_num}: Unexpected error - {str(e)}"
-                errors.append(error_msg)
-                db.rollback()
+        # The whole upload is decoded and validated in a worker thread before
+        # anything is written, so a bad byte or parse error stores nothing and
+        # the write lock is not held while the file is read
+        batches = await run_in_threadpool(
+            list, _iter_lead_batches(csv_reader, field_indexes, errors)
+        )
+        
+        # The whole import is one transaction; each batch gets a SAVEPOINT so
+        # bad rows roll back alone
+        async with write_session() as db, db.begin():
+            for batch in batches:
+                imported_count += await _flush_lead_batch(db, batch, file.filename, errors)
+        
+        # Report errors in file order; batch failures surface after later rows validate
+        errors.sort(key=lambda error: error[0])
+        failed_count = len(errors)
+        errors = [error_msg for _, error_msg in errors]
         
         # Note: Summary activity creation removed due to nullable lead_id constraint
         # Individual lead activities are still created during import
@@ -214,13 +340,15 @@ def import_leads_csv(
 
 
 @router.post("/seed")
-def seed_leads(db: Session = Depends(get_db)):
+async def seed_leads(db: AsyncSession = Depends(get_async_db)):
     """Seed the database with sample leads for development."""
     try:
-        seed_sample_leads(db)
+        # The seed helper is shared with the CLI, so run it on the sync session
+        async with write_session() as write_db:
+            await write_db.run_sync(seed_sample_leads)
         
         # Get count of leads after seeding
-        lead_count = db.query(Lead).count()
+        lead_count = await db.scalar(select(func.count()).select_from(Lead))
         
         return {
             "message": "Sample leads seeded successfully",
@@ -234,11 +362,12 @@ def seed_leads(db: Session = Depends(get_db)):
 
 
 @router.post("/{lead_id}/score")
-def score_lead(lead_id: int, db: Session = Depends(get_db)):
+async def score_lead(lead_id: int, db: AsyncSession = Depends(get_async_db)):
     """Calculate and save score for a specific lead"""
     
     # Get the lead
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
+    result = await db.execute(select(Lead).where(Lead.id == lead_id))
+    lead = result.scalar_one_or_none()
     if not lead:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -247,28 +376,27 @@ def score_lead(lead_id: int, db: Session = Depends(get_db)):
     
     try:
         # Calculate score using scoring service
-        scoring_service = ScoringService()
         score_result = scoring_service.calculate_score(lead)
         
-        # Update lead with new score
-        lead.score = score_result.total_score
-        db.commit()
-        db.refresh(lead)
-        
-        # Create activity log for scoring
-        activity = Activity(
-            lead_id=lead.id,
-            activity_type="ai_score",
-            description=f"Lead scored: {score_result.total_score}/100",
-            data={
-                "score": score_result.total_score,
-                "breakdown": score_result.breakdown,
-                "factors": score_result.factors,
-                "scoring_timestamp": "auto"
-            }
-        )
-        db.add(activity)
-        db.commit()
+        # Update lead with new score and log the activity in one transaction
+        async with write_session() as write_db, write_db.begin():
+            await write_db.execute(
+                update(Lead).where(Lead.id == lead.id).values(score=score_result.total_score)
+            )
+            
+            # Create activity log for scoring
+            activity = Activity(
+                lead_id=lead.id,
+                activity_type="ai_score",
+                description=f"Lead scored: {score_result.total_score}/100",
+                data={
+                    "score": score_result.total_score,
+                    "breakdown": score_result.breakdown,
+                    "factors": score_result.factors,
+                    "scoring_timestamp": "auto"
+                }
+            )
+            write_db.add(activity)
         
         return {
             "message": "Lead scored successfully",
@@ -279,7 +407,7 @@ def score_lead(lead_id: int, db: Session = Depends(get_db)):
         }
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Scoring failed: {str(e)}"
@@ -287,35 +415,52 @@ def score_lead(lead_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{lead_id}/activities")
-def get_lead_activities(
+async def get_lead_activities(
     lead_id: int, 
     type: Optional[str] = None,  # Filter by activity type(s), comma-separated
     limit: Optional[int] = None,
     offset: Optional[int] = 0,
-    db: Session = Depends(get_db)
+    before: Optional[int] = None,  # Keyset cursor: id of the last activity already seen
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get activities for a specific lead"""
+    """
+    Get activities for a specific lead
+    
+    Pages either by offset or, cheaper for deep pages, by passing the previous
+    page's next_before as before.
+    """
     # Check if lead exists
-    lead = db.query(Lead).filter(Lead.id == lead_id).first()
-    if not lead:
+    if not await db.scalar(select(exists().where(Lead.id == lead_id))):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Lead with id {lead_id} not found"
         )
     
     # Build query for activities
-    query = db.query(Activity).filter(Activity.lead_id == lead_id)
+    filters = [Activity.lead_id == lead_id]
     
     # Filter by activity type(s) if provided
     if type:
         activity_types = [t.strip() for t in type.split(',')]
-        query = query.filter(Activity.activity_type.in_(activity_types))
+        filters.append(Activity.activity_type.in_(activity_types))
     
-    # Get total count before applying limit/offset
-    total_count = query.count()
+    # Keyset page: only activities that sort after the cursor activity
+    page_filters = list(filters)
+    if before is not None:
+        cursor_created_at = (
+            select(Activity.created_at).where(Activity.id == before).scalar_subquery()
+        )
+        page_filters.append(or_(
+            Activity.created_at < cursor_created_at,
+            and_(Activity.created_at == cursor_created_at, Activity.id < before)
+        ))
     
-    # Order by created_at desc (newest first)
-    query = query.order_by(Activity.created_at.desc())
+    # Total count before limit/offset rides along on each row as a window
+    # function, so the page and the count come back in one query
+    query = select(Activity, func.count().over().label("total")).where(*page_filters)
+    
+    # Order by created_at desc (newest first), id breaks ties for the cursor
+    query = query.order_by(Activity.created_at.desc(), Activity.id.desc())
     
     # Apply offset
     if offset:
@@ -325,7 +470,20 @@ def get_lead_activities(
     if limit:
         query = query.limit(limit)
     
-    activities = query.all()
+    rows = (await db.execute(query)).all()
+    activities = [row.Activity for row in rows]
+    
+    if rows and before is None:
+        total_count = rows[0].total
+    elif offset or before is not None:
+        # Keyset pages or paged past the end: the window count doesn't cover
+        # every matching activity
+        total_count = await db.scalar(select(func.count(Activity.id)).where(*filters))
+    else:
+        total_count = 0
+    
+    # Cursor for the next keyset page, when this one came back full
+    next_before = activities[-1].id if limit and len(activities) == limit else None
     
     # Convert to response format
     activities_data = []
@@ -344,5 +502,6 @@ def get_lead_activities(
         "total": total_count,
         "lead_id": lead_id,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_before": next_before
     }
@@ -15,7 +15,6 @@ router = APIRouter(prefix="/api/meetings", tags=["meetings"])
 
 # Initialize meeting service
 meeting_service = MeetingService()
-ics_generator = ICSGenerator()
 
 
 @router.post("/slots", response_model=MeetingSlotsResponse)
@@ -59,7 +58,7 @@ async def generate_ics_file(request: ICSRequest):
     """
     try:
         # Generate ICS content
-        ics_content = ics_generator.generate_ics(
+        ics_content = ICSGenerator.generate_ics(
             start_datetime=request.start_datetime,
             end_datetime=request.end_datetime,
             subject=request.subject,
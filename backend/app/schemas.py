@@ -1,4 +1,4 @@
-from pydantic import BaseModel, EmailStr, ConfigDict, field_validator
+from pydantic import BaseModel, EmailStr, ConfigDict, Field, AliasChoices, field_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date, time
 
@@ -96,6 +96,7 @@ class LeadWithDetails(Lead):
 # Evaluation schemas
 class EvaluationRunRequest(BaseModel):
     include_leads: Optional[List[str]] = None  # Optional filter for specific leads
+    track_progress: bool = False  # Store a "running" record before the run starts
     
 class EvaluationRunBase(BaseModel):
     timestamp: datetime
@@ -129,9 +130,10 @@ class EvaluationRun(EvaluationRunBase):
         if 'id' in data:
             self.evaluation_id = data['id']
 
-class EvaluationRunResponse(BaseModel):
-    evaluation_id: int
-    timestamp: str
+class EvaluationRunSummary(BaseModel):
+    """Evaluation run without per-test results, for list views"""
+    evaluation_id: int = Field(validation_alias=AliasChoices("evaluation_id", "id"))
+    timestamp: datetime
     status: str
     total_tests: int
     passed_tests: int
@@ -143,6 +145,10 @@ class EvaluationRunResponse(BaseModel):
     schema_compliance_rate: float
     total_schema_errors: int
     avg_prompt_completeness: float
+    
+    model_config = ConfigDict(from_attributes=True)
+
+class EvaluationRunResponse(EvaluationRunSummary):
     results: List[Dict[str, Any]] = []
     
     @field_validator('results', mode='before')
@@ -166,6 +172,9 @@ class MeetingSlot(BaseModel):
     duration_minutes: int
     day_of_week: str
     time_formatted: str  # Human readable time
+    
+    # Slots are never modified after they're generated
+    model_config = ConfigDict(frozen=True)
 
 class MeetingSlotsResponse(BaseModel):
     """Response schema for meeting slot suggestions"""
@@ -173,6 +182,8 @@ class MeetingSlotsResponse(BaseModel):
     total_slots: int
     timezone: str
     generated_at: str
+    
+    model_config = ConfigDict(frozen=True)
 
 # ICS Calendar schemas
 class ICSRequest(BaseModel):
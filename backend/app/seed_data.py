@@ -1,3 +1,4 @@
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from app.models import Lead, Activity, CompanyProfile
 from app.db import SessionLocal
@@ -17,18 +18,23 @@ def seed_sample_leads(db: Session) -> None:
         {"name": "Enterprise Global", "domain": "entglobal.com", "size": "1000+", "industry": "Consulting", "description": "Global enterprise consulting firm"},
     ]
     
-    # Create company profiles
-    company_profiles = []
-    for company_data in companies_data:
-        # Check if company already exists
-        existing = db.query(CompanyProfile).filter_by(domain=company_data["domain"]).first()
-        if not existing:
-            company = CompanyProfile(**company_data)
-            db.add(company)
-            db.flush()  # To get the ID
-            company_profiles.append(company)
-        else:
-            company_profiles.append(existing)
+    # Look up existing company profiles in one query
+    existing_companies = db.execute(
+        select(CompanyProfile.id, CompanyProfile.name, CompanyProfile.domain).where(
+            CompanyProfile.domain.in_([c["domain"] for c in companies_data])
+        )
+    ).all()
+    existing_domains = {company.domain for company in existing_companies}
+    company_ids = {company.name: company.id for company in existing_companies}
+    
+    # Create missing company profiles in one bulk INSERT
+    new_companies = [c for c in companies_data if c["domain"] not in existing_domains]
+    if new_companies:
+        result = db.execute(
+            insert(CompanyProfile).returning(CompanyProfile.id, CompanyProfile.name),
+            new_companies
+        )
+        company_ids.update({company.name: company.id for company in result})
     
     # Sample lead data
     sample_leads = [
@@ -134,80 +140,84 @@ def seed_sample_leads(db: Session) -> None:
         }
     ]
     
-    # Create leads with activities
+    # Look up already-seeded leads in one query
+    existing_emails = set(db.scalars(
+        select(Lead.email).where(Lead.email.in_([l["email"] for l in sample_leads]))
+    ))
+    
+    # Build lead rows, skipping leads that already exist
+    lead_rows = []
     for lead_data in sample_leads:
         # Check if lead already exists
-        existing_lead = db.query(Lead).filter_by(email=lead_data["email"]).first()
-        if existing_lead:
+        if lead_data["email"] in existing_emails:
             continue
-            
-        # Find matching company profile
-        company_profile = None
-        for cp in company_profiles:
-            if cp.name == lead_data["company"]:
-                company_profile = cp
-                break
-        
-        # Create lead
-        lead = Lead(
-            name=lead_data["name"],
-            email=lead_data["email"],
-            company=lead_data["company"],
-            title=lead_data["title"],
-            stage=lead_data["stage"],
-            phone=lead_data.get("phone"),
-            linkedin_url=lead_data.get("linkedin_url"),
-            notes=lead_data.get("notes"),
-            company_profile_id=company_profile.id if company_profile else None,
-            score=round(random.uniform(60, 95), 1) if lead_data["stage"] != "New" else None
-        )
-        
-        db.add(lead)
-        db.flush()  # To get the lead ID
         
-        # Create initial activity
-        activity = Activity(
-            lead_id=lead.id,
-            activity_type="created",
-            description=f"Lead created with stage: {lead.stage}",
-            data={
-                "initial_stage": lead.stage,
-                "source": "seed_data",
-                "notes": lead.notes
-            }
-        )
-        db.add(activity)
+        lead_rows.append({
+            "name": lead_data["name"],
+            "email": lead_data["email"],
+            "company": lead_data["company"],
+            "title": lead_data["title"],
+            "stage": lead_data["stage"],
+            "phone": lead_data.get("phone"),
+            "linkedin_url": lead_data.get("linkedin_url"),
+            "notes": lead_data.get("notes"),
+            "company_profile_id": company_ids.get(lead_data["company"]),
+            "score": round(random.uniform(60, 95), 1) if lead_data["stage"] != "New" else None
+        })
+    
+    # Insert leads, then all of their activities, one statement each
+    if lead_rows:
+        leads = db.execute(
+            insert(Lead).returning(
+                Lead.id, Lead.stage, Lead.score, Lead.notes, sort_by_parameter_order=True
+            ),
+            lead_rows
+        ).all()
         
-        # Add some additional activities for non-New leads
-        if lead.stage != "New":
-            # Add qualification activity
-            qualification_activity = Activity(
-                lead_id=lead.id,
-                activity_type="qualified",
-                description="Lead qualified through initial screening",
-                data={
-                    "qualification_score": lead.score,
-                    "qualification_method": "manual"
+        activity_rows = []
+        for lead in leads:
+            # Create initial activity
+            activity_rows.append({
+                "lead_id": lead.id,
+                "activity_type": "created",
+                "description": f"Lead created with stage: {lead.stage}",
+                "data": {
+                    "initial_stage": lead.stage,
+                    "source": "seed_data",
+                    "notes": lead.notes
                 }
-            )
-            db.add(qualification_activity)
+            })
             
-        if lead.stage in ["Contacted", "Meeting Scheduled", "Won", "Lost"]:
-            # Add contact activity
-            contact_activity = Activity(
-                lead_id=lead.id,
-                activity_type="contacted",
-                description="Initial outreach completed",
-                data={
-                    "contact_method": "email",
-                    "response_received": lead.stage != "Contacted"
-                }
-            )
-            db.add(contact_activity)
+            # Add some additional activities for non-New leads
+            if lead.stage != "New":
+                # Add qualification activity
+                activity_rows.append({
+                    "lead_id": lead.id,
+                    "activity_type": "qualified",
+                    "description": "Lead qualified through initial screening",
+                    "data": {
+                        "qualification_score": lead.score,
+                        "qualification_method": "manual"
+                    }
+                })
+                
+            if lead.stage in ["Contacted", "Meeting Scheduled", "Won", "Lost"]:
+                # Add contact activity
+                activity_rows.append({
+                    "lead_id": lead.id,
+                    "activity_type": "contacted",
+                    "description": "Initial outreach completed",
+                    "data": {
+                        "contact_method": "email",
+                        "response_received": lead.stage != "Contacted"
+                    }
+                })
+        
+        db.execute(insert(Activity), activity_rows)
     
     # Commit all changes
     db.commit()
-    print(f"Seeded database with {len(sample_leads)} leads and {len(company_profiles)} company profiles")
+    print(f"Seeded database with {len(sample_leads)} leads and {len(company_ids)} company profiles")
 
 
 def main():
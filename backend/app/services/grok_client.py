@@ -6,17 +6,128 @@ Includes retry logic, schema validation, and structured response handling.
 """
 
 import os
-import json
+import orjson
 import asyncio
-from typing import Dict, Any, Optional, List
+import logging
+import random
+import time
+from collections import ChainMap
+from functools import lru_cache
+from typing import Annotated, Dict, Any, Optional, List, Literal, Union
 from dataclasses import dataclass
 from pathlib import Path
-from xai_sdk import Client
+import grpc
+from pydantic import BaseModel, Field, ValidationError
+from xai_sdk import AsyncClient
 from xai_sdk.chat import user, system
 import dotenv
 
+from app.services.llm_cache import LLMCache
 
+logger = logging.getLogger(__name__)
 
+# Load .env from the project root (three levels up from services) once at
+# import, unless the key is already in the environment
+if not os.getenv("XAI_API_KEY"):
+    dotenv_path = Path(__file__).parent.parent.parent.parent / ".env"
+    dotenv.load_dotenv(dotenv_path=dotenv_path)
+    logger.debug("Loaded .env from %s (exists: %s)", dotenv_path, dotenv_path.exists())
+
+# Response cache settings; GROK_CACHE_TTL=0 turns caching off
+GROK_CACHE_SIZE = int(os.getenv("GROK_CACHE_SIZE", "1024"))
+GROK_CACHE_TTL = int(os.getenv("GROK_CACHE_TTL", "3600"))
+
+# Upper bound on Grok requests in flight at once per client
+GROK_MAX_CONCURRENCY = int(os.getenv("GROK_MAX_CONCURRENCY", "8"))
+
+# gRPC statuses worth retrying: rate limits, timeouts and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.INTERNAL,
+})
+
+
+# Prompt templates, filled with str.format_map over the lead data
+QUALIFICATION_PROMPT = """
+You are an expert sales development representative. Analyze this lead and determine if they should be qualified for our sales pipeline.
+
+Lead Information:
+- Name: {name}
+- Title: {title}
+- Company: {company}
+- Email: {email}
+- Phone: {phone}
+- LinkedIn: {linkedin_url}
+- Notes: {notes}
+
+Qualification Criteria:
+- Decision-making authority (senior roles, executives)
+- Company size and potential budget
+- Professional contact quality
+- Likelihood of being interested in B2B solutions
+
+Please respond with a JSON object containing:
+- "verdict": "qualified" | "not_qualified" | "needs_more_info"
+- "confidence": integer from 0-100
+- "reasoning": detailed explanation of your decision
+- "factors": array of key factors that influenced your decision
+
+Example response:
+{{
+    "verdict": "qualified",
+    "confidence": 85,
+    "reasoning": "Senior technical role at enterprise company with professional contact details",
+    "factors": ["senior_title", "enterprise_company", "professional_email"]
+}}
+
+Respond only with the JSON object, no additional text.
+""".strip()
+
+OUTREACH_PROMPT = """
+You are an expert sales development representative. Write a personalized outreach email for this lead.
+
+Lead Information:
+- Name: {name}
+- Title: {title}
+- Company: {company}{context_section}
+
+Email Guidelines:
+- Professional but friendly tone
+- Personalized to their role and company
+- Clear value proposition
+- Soft call-to-action
+- Keep it concise (under 150 words)
+- Avoid being overly salesy
+
+Please respond with a JSON object containing:
+- "subject": compelling email subject line
+- "body": email body text
+- "variants": array of 2 alternative versions with different subject/body combinations
+
+Example response:
+{{
+    "subject": "Quick question about [company]'s tech stack",
+    "body": "Hi [name],\\n\\nI noticed your role as [title] at [company]. We've helped similar companies reduce their infrastructure costs by 30%.\\n\\nWould you be open to a 15-minute conversation about your current challenges?\\n\\nBest regards,\\nSales Team",
+    "variants": [
+        {{
+            "subject": "Alternative subject line",
+            "body": "Alternative email body"
+        }},
+        {{
+            "subject": "Another subject option", 
+            "body": "Another email body option"
+        }}
+    ]
+}}
+
+Respond only with the JSON object, no additional text.
+""".strip()
+
+# Values for lead fields that are missing from the lead data
+QUALIFICATION_DEFAULTS = {"name": "Unknown", "title": "Unknown", "company": "Unknown", "email": "Unknown"}
+OUTREACH_DEFAULTS = {"name": "there", "title": "", "company": ""}
 
 
 class GrokError(Exception):
@@ -41,44 +152,72 @@ class OutreachResult:
     variants: List[Dict[str, str]]  # Alternative subject/body combinations
 
 
+class QualificationPayload(BaseModel):
+    """Expected shape of a qualification response from Grok"""
+    verdict: Literal["qualified", "not_qualified", "needs_more_info"]
+    confidence: Annotated[int, Field(strict=True, ge=0, le=100)]
+    reasoning: str
+    factors: List[str]
+
+
+class OutreachPayload(BaseModel):
+    """Expected shape of an outreach response from Grok"""
+    subject: str
+    body: str
+    variants: List[Dict[str, str]]
+
+
 class GrokClient:
     """Grok API client with retry logic and validation"""
     
-    def __init__(self, api_key: Optional[str] = None, model: str = "grok-4", max_retries: int = 3):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: str = "grok-4",
+        max_retries: int = 3,
+        cache: Optional[LLMCache] = None,
+        max_concurrency: int = GROK_MAX_CONCURRENCY,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0
+    ):
         """Initialize Grok client"""
+        env_api_key = os.getenv("XAI_API_KEY")
+        logger.debug("XAI_API_KEY from env: %s", "found" if env_api_key else "missing")
+        
+        self.api_key = api_key or env_api_key
+        
+        if not self.api_key:
+            raise GrokError("XAI_API_KEY environment variable is required")
+        
         try:
-            print("=== GrokClient.__init__ starting ===")
-            
-            # Load .env file from project root directory (three levels up from services)
-            project_root = Path(__file__).parent.parent.parent.parent
-            dotenv_path = project_root / ".env"
-            
-            
-            dotenv.load_dotenv(dotenv_path=dotenv_path)
-            env_api_key = os.getenv("XAI_API_KEY")
-            
-            print(f"=== Looking for .env at: {dotenv_path} ===")
-            print(f"=== .env file exists: {dotenv_path.exists()} ===")
-            print(f"=== API key from env: {'Found' if env_api_key else 'None'} ===")
-
-            self.api_key = api_key or env_api_key
-
-            
-            if not self.api_key:
-                raise GrokError("XAI_API_KEY environment variable is required")
-            
             self.model = model
             self.max_retries = max_retries
+            self.base_delay = base_delay
+            self.max_delay = max_delay
+            # Monotonic deadline before which no request is sent, set on rate limits
+            self._cooldown_until = 0.0
+            self.cache = cache or LLMCache(maxsize=GROK_CACHE_SIZE, ttl=GROK_CACHE_TTL)
+            self._semaphore = asyncio.Semaphore(max(max_concurrency, 1))
             
-            print("=== Creating xAI Client ===")
-            self.client = Client(api_key=self.api_key)
-            print("=== GrokClient.__init__ completed successfully ===")
+            # The async gRPC channel binds to the running loop, so the client
+            # must be built from inside it (startup or a request handler)
+            self.client = AsyncClient(api_key=self.api_key)
+            logger.debug("Created xAI client for model %s", self.model)
             
-        except Exception as e:
-            print(f"=== ERROR in GrokClient.__init__: {e} ===")
-            print(f"Exception type: {type(e)}")
+        except Exception:
+            logger.exception("GrokClient initialization failed")
             raise
     
+    async def close(self) -> None:
+        """Close the underlying xAI channel"""
+        await self.client.close()
+    
+    async def __aenter__(self) -> "GrokClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
     async def qualify_lead(self, lead_data: Dict[str, Any]) -> QualificationResult:
         """
         Qualify a lead using Grok AI
@@ -101,31 +240,22 @@ class GrokClient:
         
         # Parse and validate response
         try:
-            response_data = json.loads(response_content)
-        except json.JSONDecodeError:
+            response_data = orjson.loads(response_content)
+        except orjson.JSONDecodeError:
             raise GrokError(f"Invalid JSON response from Grok: {response_content}")
         
-        # Validate required fields
-        required_fields = ["verdict", "confidence", "reasoning", "factors"]
-        missing_fields = [field for field in required_fields if field not in response_data]
-        if missing_fields:
-            raise GrokError(f"Missing required fields in Grok response: {missing_fields}")
-        
-        # Validate verdict value
-        valid_verdicts = ["qualified", "not_qualified", "needs_more_info"]
-        if response_data["verdict"] not in valid_verdicts:
-            raise GrokError(f"Invalid verdict: {response_data['verdict']}. Must be one of {valid_verdicts}")
-        
-        # Validate confidence range
-        confidence = response_data["confidence"]
-        if not isinstance(confidence, int) or not 0 <= confidence <= 100:
-            raise GrokError(f"Invalid confidence: {confidence}. Must be integer between 0-100")
+        # Validate fields, verdict value and confidence range in one pass
+        try:
+            payload = QualificationPayload.model_validate(response_data)
+        except ValidationError as e:
+            raise GrokError(f"Invalid qualification response from Grok: {e}")
         
+        self._cache_response(prompt, response_content)
         return QualificationResult(
-            verdict=response_data["verdict"],
-            confidence=confidence,
-            reasoning=response_data["reasoning"],
-            factors=response_data["factors"]
+            verdict=payload.verdict,
+            confidence=payload.confidence,
+            reasoning=payload.reasoning,
+            factors=payload.factors
         )
     
     async def generate_outreach(self, lead_data: Dict[str, Any], context: Optional[str] = None) -> OutreachResult:
@@ -151,140 +281,147 @@ class GrokClient:
         
         # Parse and validate response
         try:
-            response_data = json.loads(response_content)
-        except json.JSONDecodeError:
+            response_data = orjson.loads(response_content)
+        except orjson.JSONDecodeError:
             raise GrokError(f"Invalid JSON response from Grok: {response_content}")
         
-        # Validate required fields
-        required_fields = ["subject", "body", "variants"]
-        missing_fields = [field for field in required_fields if field not in response_data]
-        if missing_fields:
-            raise GrokError(f"Missing required fields in Grok response: {missing_fields}")
+        # Validate fields, including each variant
+        try:
+            payload = OutreachPayload.model_validate(response_data)
+        except ValidationError as e:
+            raise GrokError(f"Invalid outreach response from Grok: {e}")
         
+        self._cache_response(prompt, response_content)
         return OutreachResult(
-            subject=response_data["subject"],
-            body=response_data["body"],
-            variants=response_data["variants"]
+            subject=payload.subject,
+            body=payload.body,
+            variants=payload.variants
         )
     
+    async def qualify_leads_batch(
+        self, leads: List[Dict[str, Any]]
+    ) -> List[Union[QualificationResult, Exception]]:
+        """
+        Qualify several leads concurrently
+        
+        Args:
+            leads: List of lead dictionaries, as accepted by qualify_lead
+            
+        Returns:
+            One entry per lead, in input order: a QualificationResult, or the
+            exception raised for that lead
+        """
+        tasks = [self.qualify_lead(lead) for lead in leads]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def generate_outreach_batch(
+        self, leads: List[Dict[str, Any]], context: Optional[str] = None
+    ) -> List[Union[OutreachResult, Exception]]:
+        """
+        Generate outreach emails for several leads concurrently
+        
+        Args:
+            leads: List of lead dictionaries, as accepted by generate_outreach
+            context: Optional additional context shared by every email
+            
+        Returns:
+            One entry per lead, in input order: an OutreachResult, or the
+            exception raised for that lead
+        """
+        tasks = [self.generate_outreach(lead, context) for lead in leads]
+        return await asyncio.gather(*tasks, return_exceptions=True)
+    
     async def _call_grok_with_retry(self, prompt: str) -> str:
-        """Call Grok API with retry logic"""
+        """
+        Call Grok API with retry logic, answering repeated prompts from the cache
+        
+        Responses are not cached here; callers cache them with _cache_response
+        once they have parsed and validated, so a bad reply is never replayed.
+        """
+        cached = self.cache.get(self.cache.make_key(self.model, prompt))
+        if cached is not None:
+            return cached
+        
+        # Sampling does not modify the conversation, so one chat serves every attempt
+        chat = self.client.chat.create(model=self.model, messages=[user(prompt)])
         last_error = None
+        delay = self.base_delay
         
         for attempt in range(self.max_retries):
+            # Honour a rate-limit cooldown set by any call on this client
+            cooldown = self._cooldown_remaining()
+            if cooldown > 0:
+                await asyncio.sleep(cooldown)
+            
             try:
-                chat = self.client.chat.create(model=self.model)
-                chat.append(user(prompt))
-                response = chat.sample()
+                # Cap in-flight requests; backoff sleeps happen outside the slot
+                async with self._semaphore:
+                    response = await chat.sample()
                 return response.content
                 
             except Exception as e:
+                if not self._is_retryable(e):
+                    if isinstance(e, grpc.RpcError):
+                        raise GrokError(f"Grok API error: {e}") from e
+                    raise
+                
                 last_error = e
-                if attempt < self.max_retries - 1:
-                    # Exponential backoff: 1s, 2s, 4s
-                    wait_time = 2 ** attempt
-                    await asyncio.sleep(wait_time)
-                    continue
-                else:
+                if attempt == self.max_retries - 1:
                     break
+                
+                # Decorrelated jitter keeps concurrent retries from syncing up
+                delay = min(self.max_delay, random.uniform(self.base_delay, delay * 3))
+                if self._status_code(e) == grpc.StatusCode.RESOURCE_EXHAUSTED:
+                    self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+                await asyncio.sleep(delay)
         
         raise GrokError(f"Max retries exceeded. Last error: {last_error}")
     
+    def _cache_response(self, prompt: str, content: str) -> None:
+        """Cache a validated response for prompt"""
+        self.cache.set(self.cache.make_key(self.model, prompt), content)
+    
+    def _cooldown_remaining(self) -> float:
+        """Seconds left before requests may be sent again after a rate limit"""
+        return self._cooldown_until - time.monotonic()
+    
+    @staticmethod
+    def _status_code(error: Exception) -> Optional[grpc.StatusCode]:
+        """gRPC status of an API error, or None for other exceptions"""
+        code = getattr(error, "code", None)
+        return code() if isinstance(error, grpc.RpcError) and callable(code) else None
+    
+    @classmethod
+    def _is_retryable(cls, error: Exception) -> bool:
+        """Whether an error is transient: rate limit, timeout or server-side failure"""
+        if isinstance(error, (asyncio.TimeoutError, ConnectionError)):
+            return True
+        return cls._status_code(error) in RETRYABLE_STATUS_CODES
+    
     def _build_qualification_prompt(self, lead_data: Dict[str, Any]) -> str:
         """Build prompt for lead qualification"""
         
-        # Extract available lead information
-        name = lead_data.get("name", "Unknown")
-        title = lead_data.get("title", "Unknown")
-        company = lead_data.get("company", "Unknown")
-        email = lead_data.get("email", "Unknown")
-        phone = lead_data.get("phone", "")
-        linkedin = lead_data.get("linkedin_url", "")
-        notes = lead_data.get("notes", "")
-        
-        prompt = f"""
-You are an expert sales development representative. Analyze this lead and determine if they should be qualified for our sales pipeline.
-
-Lead Information:
-- Name: {name}
-- Title: {title}
-- Company: {company}
-- Email: {email}
-- Phone: {phone if phone else "Not provided"}
-- LinkedIn: {linkedin if linkedin else "Not provided"}
-- Notes: {notes if notes else "None"}
-
-Qualification Criteria:
-- Decision-making authority (senior roles, executives)
-- Company size and potential budget
-- Professional contact quality
-- Likelihood of being interested in B2B solutions
-
-Please respond with a JSON object containing:
-- "verdict": "qualified" | "not_qualified" | "needs_more_info"
-- "confidence": integer from 0-100
-- "reasoning": detailed explanation of your decision
-- "factors": array of key factors that influenced your decision
-
-Example response:
-{{
-    "verdict": "qualified",
-    "confidence": 85,
-    "reasoning": "Senior technical role at enterprise company with professional contact details",
-    "factors": ["senior_title", "enterprise_company", "professional_email"]
-}}
-
-Respond only with the JSON object, no additional text.
-"""
-        return prompt.strip()
+        # Optional contact fields read as placeholders when blank
+        optional = {
+            "phone": lead_data.get("phone") or "Not provided",
+            "linkedin_url": lead_data.get("linkedin_url") or "Not provided",
+            "notes": lead_data.get("notes") or "None",
+        }
+        return QUALIFICATION_PROMPT.format_map(ChainMap(optional, lead_data, QUALIFICATION_DEFAULTS))
     
     def _build_outreach_prompt(self, lead_data: Dict[str, Any], context: Optional[str] = None) -> str:
         """Build prompt for outreach generation"""
         
-        # Extract available lead information
-        name = lead_data.get("name", "there")
-        title = lead_data.get("title", "")
-        company = lead_data.get("company", "")
-        
-        context_section = f"\nAdditional Context: {context}" if context else ""
-        
-        prompt = f"""
-You are an expert sales development representative. Write a personalized outreach email for this lead.
-
-Lead Information:
-- Name: {name}
-- Title: {title}
-- Company: {company}{context_section}
-
-Email Guidelines:
-- Professional but friendly tone
-- Personalized to their role and company
-- Clear value proposition
-- Soft call-to-action
-- Keep it concise (under 150 words)
-- Avoid being overly salesy
-
-Please respond with a JSON object containing:
-- "subject": compelling email subject line
-- "body": email body text
-- "variants": array of 2 alternative versions with different subject/body combinations
+        context_section = {"context_section": f"\nAdditional Context: {context}" if context else ""}
+        return OUTREACH_PROMPT.format_map(ChainMap(context_section, lead_data, OUTREACH_DEFAULTS))
 
-Example response:
-{{
-    "subject": "Quick question about [company]'s tech stack",
-    "body": "Hi [name],\\n\\nI noticed your role as [title] at [company]. We've helped similar companies reduce their infrastructure costs by 30%.\\n\\nWould you be open to a 15-minute conversation about your current challenges?\\n\\nBest regards,\\nSales Team",
-    "variants": [
-        {{
-            "subject": "Alternative subject line",
-            "body": "Alternative email body"
-        }},
-        {{
-            "subject": "Another subject option", 
-            "body": "Another email body option"
-        }}
-    ]
-}}
 
-Respond only with the JSON object, no additional text.
-"""
-        return prompt.strip()
+@lru_cache(maxsize=1)
+def get_grok_client() -> GrokClient:
+    """
+    Shared GrokClient for the process, built on first use
+    
+    Raises:
+        GrokError: If no API key is configured (the failure is not cached)
+    """
+    return GrokClient()
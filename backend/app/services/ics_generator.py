@@ -4,20 +4,62 @@ ICS Calendar File Generator Service
 Handles generation of ICS (iCalendar) files for meeting invitations.
 """
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import List, Optional
 import uuid
 
+ICS_VERSION = "2.0"
+ICS_PRODID = "-//Grok SDR//Meeting Scheduler//EN"
+
+# ICS text escapes, applied in a single pass: backslash, comma, semicolon and
+# newline are escaped, carriage returns are dropped
+ICS_ESCAPE_TABLE = str.maketrans({
+    "\\": "\\\\",
+    ",": "\\,",
+    ";": "\\;",
+    "\n": "\\n",
+    "\r": None,
+})
+
+# UTC date-time form used for DTSTART, DTEND and DTSTAMP
+ICS_DATETIME_FORMAT = "%Y%m%dT%H%M%SZ"
+
+# Fixed shape of a single-event invite; attendees is a pre-joined block of
+# CRLF-prefixed ATTENDEE lines
+ICS_TEMPLATE = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:{version}\r\n"
+    "PRODID:{prodid}\r\n"
+    "CALSCALE:GREGORIAN\r\n"
+    "METHOD:REQUEST\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:{uid}\r\n"
+    "DTSTART:{start}\r\n"
+    "DTEND:{end}\r\n"
+    "DTSTAMP:{stamp}\r\n"
+    "SUMMARY:{summary}\r\n"
+    "DESCRIPTION:{description}\r\n"
+    "LOCATION:{location}\r\n"
+    "ORGANIZER:CN={organizer_name}:MAILTO:{organizer_email}\r\n"
+    "STATUS:CONFIRMED\r\n"
+    "SEQUENCE:0\r\n"
+    "TRANSP:OPAQUE"
+    "{attendees}\r\n"
+    "BEGIN:VALARM\r\n"
+    "TRIGGER:-PT15M\r\n"
+    "ACTION:DISPLAY\r\n"
+    "DESCRIPTION:{summary}\r\n"
+    "END:VALARM\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR"
+)
+
 
 class ICSGenerator:
     """Service for generating ICS calendar files"""
     
-    def __init__(self):
-        self.version = "2.0"
-        self.prodid = "-//Grok SDR//Meeting Scheduler//EN"
-    
+    @staticmethod
     def generate_ics(
-        self,
         start_datetime: str,
         end_datetime: str,
         subject: str,
@@ -47,82 +89,46 @@ class ICSGenerator:
             attendees = []
         
         # Generate unique event ID
-        event_uid = f"{uuid.uuid4()}@grok-sdr.com"
+        event_uid = f"{uuid.uuid4().hex}@grok-sdr.com"
         
         # Format datetimes for ICS (YYYYMMDDTHHMMSSZ)
-        start_formatted = self._format_datetime_for_ics(start_datetime)
-        end_formatted = self._format_datetime_for_ics(end_datetime)
-        now_formatted = self._format_datetime_for_ics(datetime.now().isoformat())
+        start_formatted = ICSGenerator._format_datetime_for_ics(start_datetime)
+        end_formatted = ICSGenerator._format_datetime_for_ics(end_datetime)
+        now_formatted = datetime.now(timezone.utc).strftime(ICS_DATETIME_FORMAT)
         
-        # Build ICS content
-        ics_content = [
-            "BEGIN:VCALENDAR",
-            f"VERSION:{self.version}",
-            f"PRODID:{self.prodid}",
-            "CALSCALE:GREGORIAN",
-            "METHOD:REQUEST",
-            "BEGIN:VEVENT",
-            f"UID:{event_uid}",
-            f"DTSTART:{start_formatted}",
-            f"DTEND:{end_formatted}",
-            f"DTSTAMP:{now_formatted}",
-            f"SUMMARY:{self._escape_text(subject)}",
-            f"DESCRIPTION:{self._escape_text(description)}",
-            f"LOCATION:{self._escape_text(location)}",
-            f"ORGANIZER:CN={self._escape_text(organizer_name)}:MAILTO:{organizer_email}",
-            "STATUS:CONFIRMED",
-            "SEQUENCE:0",
-            "TRANSP:OPAQUE",
-        ]
-        
-        # Add attendees
-        for attendee in attendees:
-            ics_content.append(f"ATTENDEE:MAILTO:{attendee}")
-        
-        # Add reminder
-        ics_content.extend([
-            "BEGIN:VALARM",
-            "TRIGGER:-PT15M",
-            "ACTION:DISPLAY",
-            f"DESCRIPTION:{self._escape_text(subject)}",
-            "END:VALARM",
-            "END:VEVENT",
-            "END:VCALENDAR"
-        ])
-        
-        return "\r\n".join(ics_content)
+        summary = ICSGenerator._escape_text(subject)
+        return ICS_TEMPLATE.format(
+            version=ICS_VERSION,
+            prodid=ICS_PRODID,
+            uid=event_uid,
+            start=start_formatted,
+            end=end_formatted,
+            stamp=now_formatted,
+            summary=summary,
+            description=ICSGenerator._escape_text(description),
+            location=ICSGenerator._escape_text(location),
+            organizer_name=ICSGenerator._escape_text(organizer_name),
+            organizer_email=organizer_email,
+            attendees="".join(f"\r\nATTENDEE:MAILTO:{attendee}" for attendee in attendees),
+        )
     
-    def _format_datetime_for_ics(self, iso_datetime: str) -> str:
+    @staticmethod
+    def _format_datetime_for_ics(iso_datetime: str) -> str:
         """Convert ISO datetime to ICS format (YYYYMMDDTHHMMSSZ)"""
         try:
-            # Parse ISO datetime
-            if iso_datetime.endswith('Z'):
-                dt = datetime.fromisoformat(iso_datetime[:-1])
-                dt = dt.replace(tzinfo=None)  # Remove timezone info for UTC
-            elif '+' in iso_datetime or iso_datetime.count('-') > 2:
-                # Handle timezone offset
-                dt = datetime.fromisoformat(iso_datetime.replace('Z', '+00:00'))
-                dt = dt.utctimetuple()
-                return datetime(*dt[:6]).strftime('%Y%m%dT%H%M%SZ')
-            else:
-                dt = datetime.fromisoformat(iso_datetime)
-            
-            # Format as ICS datetime
-            return dt.strftime('%Y%m%dT%H%M%SZ')
-        except Exception:
+            # Offsets (including Z) are converted to UTC; naive times are taken as UTC
+            dt = datetime.fromisoformat(iso_datetime)
+            if dt.tzinfo is not None:
+                dt = dt.astimezone(timezone.utc)
+            return dt.strftime(ICS_DATETIME_FORMAT)
+        except (TypeError, ValueError):
             # Fallback to current time if parsing fails
-            return datetime.now().strftime('%Y%m%dT%H%M%SZ')
+            return datetime.now(timezone.utc).strftime(ICS_DATETIME_FORMAT)
     
-    def _escape_text(self, text: str) -> str:
+    @staticmethod
+    def _escape_text(text: str) -> str:
         """Escape text for ICS format"""
         if not text:
             return ""
         
-        # Replace special characters
-        text = text.replace("\\", "\\\\")
-        text = text.replace(",", "\\,")
-        text = text.replace(";", "\\;")
-        text = text.replace("\n", "\\n")
-        text = text.replace("\r", "")
-        
-        return text
+        return text.translate(ICS_ESCAPE_TABLE)
@@ -0,0 +1,51 @@
+"""
+LLM Response Cache
+
+In-process cache of raw LLM responses keyed by model and prompt, so identical
+requests skip the API round-trip.
+"""
+
+import hashlib
+import orjson
+from typing import Optional
+from cachetools import TTLCache
+
+
+class LLMCache:
+    """Exact-match LRU cache of LLM responses with a per-entry TTL"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600):
+        """
+        Initialize the cache
+        
+        Args:
+            maxsize: Maximum number of cached responses
+            ttl: Seconds a response stays cached; 0 disables caching
+        """
+        self.enabled = ttl > 0 and maxsize > 0
+        self._entries = TTLCache(maxsize=max(maxsize, 1), ttl=max(ttl, 1))
+        self.hits = 0
+        self.misses = 0
+    
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Stable cache key for a model/prompt pair"""
+        payload = orjson.dumps({"model": model, "prompt": prompt}, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None on a miss"""
+        if not self.enabled:
+            return None
+        
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+    
+    def set(self, key: str, value: str) -> None:
+        """Cache a response"""
+        if self.enabled:
+            self._entries[key] = value
@@ -5,11 +5,23 @@ Handles meeting slot generation and scheduling logic.
 """
 
 from datetime import datetime, timedelta, time
-from typing import List, Optional
-import pytz
+from functools import lru_cache
+from itertools import islice
+from typing import Iterator, List, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from app.schemas import MeetingSlot, MeetingSlotsResponse
 
 
+# English weekday names indexed by datetime.weekday()
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+@lru_cache(maxsize=256)
+def _get_tz(name: str) -> ZoneInfo:
+    """Look up a timezone by IANA name, reusing earlier lookups"""
+    return ZoneInfo(name)
+
+
 class MeetingService:
     """Service for handling meeting-related operations"""
     
@@ -21,6 +33,16 @@ class MeetingService:
             time(14, 0),  # 2:00 PM
             time(15, 30), # 3:30 PM
         ]
+        
+        # Candidate start times within a day: preferred times first, then the
+        # remaining half-hours of business hours in order
+        preferred = set(self.preferred_times)
+        self.slot_times = self.preferred_times + [
+            time(hour, minute)
+            for hour in range(self.business_hours_start.hour, self.business_hours_end.hour)
+            for minute in (0, 30)
+            if time(hour, minute) not in preferred
+        ]
     
     def generate_meeting_slots(
         self, 
@@ -41,76 +63,21 @@ class MeetingService:
         """
         try:
             # Parse timezone
-            tz = pytz.timezone(timezone)
-        except pytz.exceptions.UnknownTimeZoneError:
+            tz = _get_tz(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
             # Fallback to UTC if timezone is invalid
-            tz = pytz.UTC
+            tz = _get_tz("UTC")
             timezone = "UTC"
         
         # Get current time in the target timezone
         now = datetime.now(tz)
         
-        # Generate slots for the next 5 business days
-        slots = []
-        current_date = now.date()
-        days_ahead = 0
-        
-        while len(slots) < num_slots and days_ahead < 10:  # Look ahead max 10 days
-            # Skip weekends
-            if current_date.weekday() < 5:  # Monday = 0, Friday = 4
-                # Try preferred times first
-                for preferred_time in self.preferred_times:
-                    if len(slots) >= num_slots:
-                        break
-                    
-                    # Create datetime for this slot
-                    slot_datetime = tz.localize(
-                        datetime.combine(current_date, preferred_time)
-                    )
-                    
-                    # Only suggest future slots
-                    if slot_datetime > now:
-                        slot = self._create_meeting_slot(
-                            slot_datetime, 
-                            timezone, 
-                            duration_minutes
-                        )
-                        slots.append(slot)
-                
-                # If we need more slots, try other business hours
-                if len(slots) < num_slots:
-                    for hour in range(9, 17):  # 9 AM to 5 PM
-                        if len(slots) >= num_slots:
-                            break
-                        
-                        for minute in [0, 30]:  # Every 30 minutes
-                            slot_time = time(hour, minute)
-                            
-                            # Skip if we already have this time
-                            if slot_time in self.preferred_times:
-                                continue
-                            
-                            slot_datetime = tz.localize(
-                                datetime.combine(current_date, slot_time)
-                            )
-                            
-                            if slot_datetime > now:
-                                slot = self._create_meeting_slot(
-                                    slot_datetime, 
-                                    timezone, 
-                                    duration_minutes
-                                )
-                                slots.append(slot)
-            
-            # Move to next day
-            current_date += timedelta(days=1)
-            days_ahead += 1
-        
-        # Sort slots by datetime
-        slots.sort(key=lambda x: x.datetime)
-        
-        # Take only the requested number of slots
-        slots = slots[:num_slots]
+        # Take the first slots in preference order, then list them chronologically
+        slot_datetimes = sorted(islice(self._iter_slot_datetimes(now, tz), num_slots))
+        slots = [
+            self._create_meeting_slot(slot_datetime, timezone, duration_minutes)
+            for slot_datetime in slot_datetimes
+        ]
         
         return MeetingSlotsResponse(
             slots=slots,
@@ -119,6 +86,27 @@ class MeetingService:
             generated_at=now.isoformat()
         )
     
+    def _iter_slot_datetimes(self, now: datetime, tz: ZoneInfo) -> Iterator[datetime]:
+        """Yield future slot start times day by day, preferred times first within each day"""
+        start_date = now.date()
+        now_time = now.time()  # Wall-clock time in tz
+        
+        for days_ahead in range(10):  # Look ahead max 10 days
+            current_date = start_date + timedelta(days=days_ahead)
+            
+            # Skip weekends
+            if current_date.weekday() >= 5:  # Saturday = 5, Sunday = 6
+                continue
+            
+            year, month, day = current_date.year, current_date.month, current_date.day
+            for slot_time in self.slot_times:
+                # Only suggest future slots; only today's can be in the past,
+                # so they are filtered before any datetime is built
+                if days_ahead == 0 and slot_time <= now_time:
+                    continue
+                
+                yield datetime(year, month, day, slot_time.hour, slot_time.minute, tzinfo=tz)
+    
     def _create_meeting_slot(
         self, 
         slot_datetime: datetime, 
@@ -128,8 +116,7 @@ class MeetingService:
         """Create a MeetingSlot object from datetime"""
         
         # Format day of week
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        day_of_week = day_names[slot_datetime.weekday()]
+        day_of_week = DAY_NAMES[slot_datetime.weekday()]
         
         # Format time for display
         time_formatted = slot_datetime.strftime("%I:%M %p")
@@ -8,13 +8,35 @@ Calculates lead scores based on configurable weights and multiple factors:
 - Contact quality (professional email, LinkedIn presence)
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Any
+from collections import namedtuple
 from dataclasses import dataclass
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
 import re
 from app.models import Lead
 
+# Lead fields counted towards data completeness, read in one C-level call
+COMPLETENESS_FIELDS = ('name', 'email', 'company', 'title', 'phone', 'linkedin_url', 'notes')
+_get_completeness_fields = attrgetter(*COMPLETENESS_FIELDS)
 
-@dataclass
+# Hashable snapshot of every lead field scoring reads; the score cache key
+LeadFields = namedtuple('LeadFields', COMPLETENESS_FIELDS)
+
+# Scored leads remembered per ScoringService instance
+SCORE_CACHE_SIZE = 10_000
+
+# Weight keys in the order factors are scored and reported
+FACTOR_KEYS = ('data_completeness', 'title_seniority', 'company_size', 'contact_quality')
+
+
+def _keyword_pattern(keywords) -> re.Pattern:
+    """Compile keywords into one alternation that finds any of them as a substring"""
+    return re.compile('|'.join(re.escape(keyword) for keyword in sorted(keywords)))
+
+
+@dataclass(slots=True, frozen=True)
 class ScoreItem:
     """Individual scoring factor"""
     factor: str
@@ -23,7 +45,7 @@ class ScoreItem:
     reasoning: str
 
 
-@dataclass 
+@dataclass(slots=True, frozen=True)
 class ScoreBreakdown:
     """Complete scoring breakdown"""
     total_score: float
@@ -34,12 +56,12 @@ class ScoreBreakdown:
 class ScoringService:
     """Service for calculating lead scores with configurable weights"""
     
-    DEFAULT_WEIGHTS = {
+    DEFAULT_WEIGHTS = MappingProxyType({
         'data_completeness': 30,
         'title_seniority': 35, 
         'company_size': 20,
         'contact_quality': 15
-    }
+    })
     
     # Company size indicators
     ENTERPRISE_DOMAINS = {
@@ -70,31 +92,62 @@ class ScoringService:
         'senior engineer', 'senior developer', 'tech lead', 'engineering manager'
     }
     
+    # Keyword tiers compiled once, so each check is a single regex scan
+    EXECUTIVE_TITLE_PATTERN = _keyword_pattern(EXECUTIVE_TITLES)
+    SENIOR_TITLE_PATTERN = _keyword_pattern(SENIOR_TITLES)
+    IC_TITLE_PATTERN = _keyword_pattern({'analyst', 'coordinator', 'specialist', 'associate'})
+    ENTERPRISE_KEYWORD_PATTERN = _keyword_pattern(ENTERPRISE_KEYWORDS)
+    STARTUP_KEYWORD_PATTERN = _keyword_pattern({'startup', 'inc.', 'llc'})
+    
+    # Contact quality patterns, compiled once
+    CONSUMER_EMAIL_PATTERN = re.compile(r'gmail|yahoo|hotmail|outlook')
+    PHONE_PATTERN = re.compile(r'^[\+]?[1]?[\s\-\.]?[\(]?[0-9]{3}[\)]?[\s\-\.]?[0-9]{3}[\s\-\.]?[0-9]{4}$')
+    PHONE_STRIP_TABLE = str.maketrans('', '', ' -().')
+    
     def __init__(self, weights: Optional[Dict[str, float]] = None):
         """Initialize scoring service with optional custom weights"""
-        self.weights = weights or self.DEFAULT_WEIGHTS.copy()
+        # Copy so normalizing never modifies the caller's mapping
+        self.weights = dict(weights or self.DEFAULT_WEIGHTS)
         
         # Normalize weights to sum to 100
         total_weight = sum(self.weights.values())
         if total_weight != 100:
             for key in self.weights:
                 self.weights[key] = (self.weights[key] / total_weight) * 100
+        
+        # Weights in FACTOR_KEYS order, looked up once instead of per lead
+        self.factor_weights = tuple(self.weights[key] for key in FACTOR_KEYS)
+        (
+            self._completeness_weight,
+            self._title_weight,
+            self._company_weight,
+            self._contact_weight,
+        ) = self.factor_weights
+        
+        # Per-instance cache, since results depend on this service's weights
+        self._cached_score = lru_cache(maxsize=SCORE_CACHE_SIZE)(self._calculate_score)
     
     def calculate_score(self, lead: Lead) -> ScoreBreakdown:
-        """Calculate comprehensive lead score with breakdown"""
+        """
+        Calculate comprehensive lead score with breakdown
         
-        # Calculate individual factor scores
-        completeness_score = self._score_data_completeness(lead)
-        seniority_score = self._score_title_seniority(lead)
-        company_score = self._score_company_size(lead)
-        contact_score = self._score_contact_quality(lead)
+        Leads with identical scored fields share one cached result, so the
+        returned breakdown must not be modified.
+        """
+        return self._cached_score(LeadFields(*_get_completeness_fields(lead)))
+    
+    def clear_cache(self) -> None:
+        """Forget cached scores"""
+        self._cached_score.cache_clear()
+    
+    def _calculate_score(self, lead: LeadFields) -> ScoreBreakdown:
+        """Score a snapshot of lead fields; wrapped by the per-instance cache"""
+        factor_scores = self._score_factors(lead)
         
         # Apply weights and calculate total
         weighted_scores = {
-            'data_completeness': (completeness_score.score * self.weights['data_completeness']) / 100,
-            'title_seniority': (seniority_score.score * self.weights['title_seniority']) / 100,
-            'company_size': (company_score.score * self.weights['company_size']) / 100,
-            'contact_quality': (contact_score.score * self.weights['contact_quality']) / 100
+            key: (item.score * weight) / 100
+            for key, item, weight in zip(FACTOR_KEYS, factor_scores, self.factor_weights)
         }
         
         total_score = sum(weighted_scores.values())
@@ -102,33 +155,13 @@ class ScoringService:
         # Build breakdown for transparency
         breakdown = [
             {
-                'factor': completeness_score.factor,
-                'score': completeness_score.score,
-                'weight': self.weights['data_completeness'],
-                'weighted_score': weighted_scores['data_completeness'],
-                'reasoning': completeness_score.reasoning
-            },
-            {
-                'factor': seniority_score.factor,
-                'score': seniority_score.score,
-                'weight': self.weights['title_seniority'],
-                'weighted_score': weighted_scores['title_seniority'],
-                'reasoning': seniority_score.reasoning
-            },
-            {
-                'factor': company_score.factor,
-                'score': company_score.score,
-                'weight': self.weights['company_size'],
-                'weighted_score': weighted_scores['company_size'],
-                'reasoning': company_score.reasoning
-            },
-            {
-                'factor': contact_score.factor,
-                'score': contact_score.score,
-                'weight': self.weights['contact_quality'],
-                'weighted_score': weighted_scores['contact_quality'],
-                'reasoning': contact_score.reasoning
+                'factor': item.factor,
+                'score': item.score,
+                'weight': weight,
+                'weighted_score': weighted_scores[key],
+                'reasoning': item.reasoning
             }
+            for key, item, weight in zip(FACTOR_KEYS, factor_scores, self.factor_weights)
         ]
         
         return ScoreBreakdown(
@@ -137,16 +170,51 @@ class ScoringService:
             factors=weighted_scores
         )
     
+    def calculate_scores(self, leads: Iterable[Lead]) -> List[float]:
+        """
+        Calculate total scores for many leads without building breakdowns
+        
+        Each total equals calculate_score(lead).total_score.
+        """
+        return [total for _, total in self.iter_scores(leads)]
+    
+    def iter_scores(self, leads: Iterable[Lead]) -> Iterator[Tuple[int, float]]:
+        """
+        Lazily yield (lead id, total score) pairs
+        
+        Leads are scored one at a time as the iterator is consumed, so a
+        large query result can be streamed into score updates.
+        """
+        for lead in leads:
+            yield lead.id, self._total_score(lead)
+    
+    def _total_score(self, lead: Lead) -> float:
+        """Total score alone, equal to calculate_score(lead).total_score"""
+        return round(sum(
+            (item.score * weight) / 100
+            for item, weight in zip(self._score_factors(lead), self.factor_weights)
+        ), 1)
+    
+    def _score_factors(self, lead: Lead) -> Tuple[ScoreItem, ...]:
+        """Calculate individual factor scores, in FACTOR_KEYS order"""
+        # Email domain, shared by the company size and contact quality factors
+        email = lead.email or ''
+        domain = email.rpartition('@')[2].lower() if '@' in email else ''
+        
+        return (
+            self._score_data_completeness(lead),
+            self._score_title_seniority(lead),
+            self._score_company_size(lead, domain),
+            self._score_contact_quality(lead, domain)
+        )
+    
     def _score_data_completeness(self, lead: Lead) -> ScoreItem:
         """Score based on how complete the lead data is"""
-        fields = ['name', 'email', 'company', 'title', 'phone', 'linkedin_url', 'notes']
-        filled_fields = 0
-        total_fields = len(fields)
-        
-        for field in fields:
-            value = getattr(lead, field, None)
-            if value and str(value).strip():
-                filled_fields += 1
+        filled_fields = sum(
+            1 for value in _get_completeness_fields(lead)
+            if value and (value.strip() if isinstance(value, str) else str(value).strip())
+        )
+        total_fields = len(COMPLETENESS_FIELDS)
         
         # Name and email are required, so start from those
         completeness_ratio = filled_fields / total_fields
@@ -157,13 +225,13 @@ class ScoringService:
         return ScoreItem(
             factor="Data Completeness",
             score=score,
-            weight=self.weights['data_completeness'],
+            weight=self._completeness_weight,
             reasoning=reasoning
         )
     
     def _score_title_seniority(self, lead: Lead) -> ScoreItem:
         """Score based on job title seniority and decision-making power"""
-        title = getattr(lead, 'title', '') or ''
+        title = lead.title or ''
         title_lower = title.lower()
         
         score = 20  # Base score for having a title
@@ -171,13 +239,13 @@ class ScoringService:
         
         if not title.strip():
             score = 0
-        elif any(exec_title in title_lower for exec_title in self.EXECUTIVE_TITLES):
+        elif self.EXECUTIVE_TITLE_PATTERN.search(title_lower):
             score = 90
             reasoning = f"Executive-level title: {title}"
-        elif any(senior_title in title_lower for senior_title in self.SENIOR_TITLES):
+        elif self.SENIOR_TITLE_PATTERN.search(title_lower):
             score = 70
             reasoning = f"Senior-level title: {title}"
-        elif any(keyword in title_lower for keyword in ['analyst', 'coordinator', 'specialist', 'associate']):
+        elif self.IC_TITLE_PATTERN.search(title_lower):
             score = 40
             reasoning = f"Individual contributor title: {title}"
         else:
@@ -187,28 +255,23 @@ class ScoringService:
         return ScoreItem(
             factor="Title Seniority",
             score=score,
-            weight=self.weights['title_seniority'],
+            weight=self._title_weight,
             reasoning=reasoning
         )
     
-    def _score_company_size(self, lead: Lead) -> ScoreItem:
-        """Score based on company size indicators"""
-        email = getattr(lead, 'email', '') or ''
-        company = getattr(lead, 'company', '') or ''
+    def _score_company_size(self, lead: Lead, domain: str) -> ScoreItem:
+        """Score based on company size indicators and the lead's email domain"""
+        company = lead.company or ''
+        company_lower = company.lower()
         
         score = 50  # Default score
         reasoning = "Unknown company size"
         
-        # Extract domain from email
-        domain = ''
-        if '@' in email:
-            domain = email.split('@')[1].lower()
-        
         # Check for enterprise domains
         if domain in self.ENTERPRISE_DOMAINS:
             score = 95
             reasoning = f"Fortune 500 company domain: {domain}"
-        elif any(keyword in company.lower() for keyword in self.ENTERPRISE_KEYWORDS):
+        elif self.ENTERPRISE_KEYWORD_PATTERN.search(company_lower):
             score = 80
             reasoning = f"Enterprise company indicators in: {company}"
         elif domain.endswith('.edu'):
@@ -217,7 +280,7 @@ class ScoringService:
         elif domain.endswith('.gov'):
             score = 75
             reasoning = f"Government organization: {domain}"
-        elif any(startup_indicator in company.lower() for startup_indicator in ['startup', 'inc.', 'llc']):
+        elif self.STARTUP_KEYWORD_PATTERN.search(company_lower):
             score = 40
             reasoning = f"Startup/small business indicators: {company}"
         elif company and len(company) > 0:
@@ -230,26 +293,25 @@ class ScoringService:
         return ScoreItem(
             factor="Company Size",
             score=score,
-            weight=self.weights['company_size'],
+            weight=self._company_weight,
             reasoning=reasoning
         )
     
-    def _score_contact_quality(self, lead: Lead) -> ScoreItem:
-        """Score based on contact information quality"""
-        email = getattr(lead, 'email', '') or ''
-        phone = getattr(lead, 'phone', '') or ''
-        linkedin_url = getattr(lead, 'linkedin_url', '') or ''
+    def _score_contact_quality(self, lead: Lead, domain: str) -> ScoreItem:
+        """Score based on contact information quality and the lead's email domain"""
+        email = lead.email or ''
+        phone = lead.phone or ''
+        linkedin_url = lead.linkedin_url or ''
         
         score = 0
         quality_factors = []
         
         # Email quality (always present since it's required)
         if '@' in email:
-            domain = email.split('@')[1].lower()
             if domain in self.ENTERPRISE_DOMAINS:
                 score += 40
                 quality_factors.append("enterprise email domain")
-            elif not any(consumer in domain for consumer in ['gmail', 'yahoo', 'hotmail', 'outlook']):
+            elif not self.CONSUMER_EMAIL_PATTERN.search(domain):
                 score += 35
                 quality_factors.append("business email domain")
             else:
@@ -258,8 +320,7 @@ class ScoringService:
         
         # Phone number presence and format
         if phone and len(phone.strip()) > 0:
-            if re.match(r'^[\+]?[1]?[\s\-\.]?[\(]?[0-9]{3}[\)]?[\s\-\.]?[0-9]{3}[\s\-\.]?[0-9]{4}$', 
-                       phone.replace(' ', '').replace('-', '').replace('(', '').replace(')', '').replace('.', '')):
+            if self.PHONE_PATTERN.match(phone.translate(self.PHONE_STRIP_TABLE)):
                 score += 30
                 quality_factors.append("properly formatted phone")
             else:
@@ -282,6 +343,6 @@ class ScoringService:
         return ScoreItem(
             factor="Contact Quality",
             score=score,
-            weight=self.weights['contact_quality'],
+            weight=self._contact_weight,
             reasoning=reasoning
         )
@@ -4,83 +4,37 @@ Evaluation system for AI SDR using XAI Grok API
 import asyncio
 import sys
 from datetime import datetime
-from typing import List, Dict, Any
+from functools import lru_cache
+from typing import List, Dict, Any, Optional
 from pathlib import Path
+import orjson
 
 # Add backend to path to import GrokClient
 backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 
 from app.services.grok_client import GrokClient, GrokError
+from app.services.llm_cache import LLMCache
 
-# Sample test leads for evaluation
-FIXTURE_LEADS = [
-    {
-        "name": "Sarah Johnson",
-        "email": "sarah.johnson@techcorp.com",
-        "company": "TechCorp Inc",
-        "title": "VP of Engineering",
-        "phone": "+1-555-0123",
-        "linkedin_url": "https://linkedin.com/in/sarahjohnson",
-        "notes": "Looking for AI solutions to improve development workflow",
-        "expected_verdict": "qualified",
-        "expected_confidence_range": [70, 90]
-    },
-    {
-        "name": "Mike Chen",
-        "email": "mike.chen@startup.io",
-        "company": "StartupIO",
-        "title": "CTO",
-        "phone": "+1-555-0456",
-        "linkedin_url": "https://linkedin.com/in/mikechen",
-        "notes": "Early stage startup, budget constraints",
-        "expected_verdict": "not_qualified",
-        "expected_confidence_range": [60, 80]
-    },
-    {
-        "name": "Jennifer Davis",
-        "email": "j.davis@enterprise.com",
-        "company": "Enterprise Corp",
-        "title": "Director of Technology",
-        "phone": "+1-555-0789",
-        "linkedin_url": "https://linkedin.com/in/jenniferdavis",
-        "notes": "Large enterprise, looking for scalable solutions",
-        "expected_verdict": "qualified",
-        "expected_confidence_range": [75, 95]
-    },
-    {
-        "name": "Alex Rodriguez",
-        "email": "alex@smallbiz.com",
-        "company": "SmallBiz Solutions",
-        "title": "Owner",
-        "phone": "+1-555-0321",
-        "linkedin_url": "https://linkedin.com/in/alexrodriguez",
-        "notes": "Small business, limited budget",
-        "expected_verdict": "not_qualified",
-        "expected_confidence_range": [50, 70]
-    },
-    {
-        "name": "Lisa Wang",
-        "email": "lisa.wang@fortune500.com",
-        "company": "Fortune 500 Corp",
-        "title": "VP of Operations",
-        "phone": "+1-555-0654",
-        "linkedin_url": "https://linkedin.com/in/lisawang",
-        "notes": "Fortune 500 company, high budget potential",
-        "expected_verdict": "qualified",
-        "expected_confidence_range": [80, 95]
-    }
-]
+# Sample test leads for evaluation, read on first use
+FIXTURES_PATH = Path(__file__).parent / "fixtures.json"
 
+@lru_cache(maxsize=1)
 def load_fixture_leads() -> List[Dict[str, Any]]:
     """Load test leads for evaluation"""
-    return FIXTURE_LEADS
+    return orjson.loads(FIXTURES_PATH.read_bytes())
+
+def make_eval_grok_client() -> GrokClient:
+    """GrokClient for evaluations, with response caching off so every run re-measures the model"""
+    return GrokClient(cache=LLMCache(ttl=0))
 
-async def run_evaluation(lead: Dict[str, Any]) -> Dict[str, Any]:
+async def run_evaluation(lead: Dict[str, Any], grok_client: Optional[GrokClient] = None) -> Dict[str, Any]:
     """Run evaluation for a single lead using XAI Grok API"""
+    owns_client = grok_client is None
     try:
-        # Initialize Grok client
-        grok_client = GrokClient()
+        # Caller's client, or an uncached one for just this lead
+        if owns_client:
+            grok_client = make_eval_grok_client()
         
         # Run qualification using XAI
         qualification_result = await grok_client.qualify_lead(lead)
@@ -140,21 +94,34 @@ async def run_evaluation(lead: Dict[str, Any]) -> Dict[str, Any]:
             "schema_errors": [str(e)],
             "error": str(e)
         }
+    finally:
+        if owns_client and grok_client is not None:
+            await grok_client.close()
 
-async def run_all_evaluations() -> Dict[str, Any]:
-    """Run evaluations for all test leads using XAI Grok API"""
+async def evaluate_leads(
+    leads: List[Dict[str, Any]], grok_client: Optional[GrokClient] = None
+) -> List[Dict[str, Any]]:
+    """Evaluate leads concurrently over one client, uncached unless the caller supplies one"""
+    if grok_client is None:
+        try:
+            grok_client = make_eval_grok_client()
+        except GrokError:
+            # No API key; each lead reports the error in its result
+            pass
+        else:
+            async with grok_client:
+                return await evaluate_leads(leads, grok_client)
+    
+    # The client caps requests in flight
+    return await asyncio.gather(*(run_evaluation(lead, grok_client) for lead in leads))
+
+async def run_all_evaluations(grok_client: Optional[GrokClient] = None) -> Dict[str, Any]:
+    """Run evaluations for all test leads using XAI Grok API, over one shared client"""
     leads = load_fixture_leads()
-    results = []
     
     print(f"Starting evaluation of {len(leads)} leads using XAI Grok API...")
     
-    for i, lead in enumerate(leads, 1):
-        print(f"Evaluating lead {i}/{len(leads)}: {lead['name']}")
-        result = await run_evaluation(lead)
-        results.append(result)
-        
-        # Small delay to avoid rate limiting
-        await asyncio.sleep(0.5)
+    results = await evaluate_leads(leads, grok_client)
     
     print("Evaluation completed!")
     return generate_enhanced_report(results)
@@ -162,13 +129,24 @@ async def run_all_evaluations() -> Dict[str, Any]:
 def generate_enhanced_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Generate evaluation report from results"""
     total_tests = len(results)
-    passed_tests = sum(1 for r in results if r["overall_pass"])
-    failed_tests = sum(1 for r in results if not r["overall_pass"] and not r["error"])
-    error_tests = sum(1 for r in results if r["error"])
+    passed_tests = failed_tests = error_tests = 0
+    verdict_matches = confidence_in_range = schema_valid = total_schema_errors = 0
     
-    verdict_matches = sum(1 for r in results if r["verdict_match"])
-    confidence_in_range = sum(1 for r in results if r["confidence_in_range"])
-    schema_valid = sum(1 for r in results if r["schema_valid"])
+    # Tally everything in one pass over the results
+    for r in results:
+        if r["overall_pass"]:
+            passed_tests += 1
+        elif not r["error"]:
+            failed_tests += 1
+        if r["error"]:
+            error_tests += 1
+        if r["verdict_match"]:
+            verdict_matches += 1
+        if r["confidence_in_range"]:
+            confidence_in_range += 1
+        if r["schema_valid"]:
+            schema_valid += 1
+        total_schema_errors += len(r["schema_errors"])
     
     return {
         "timestamp": datetime.now().isoformat(),
@@ -180,7 +158,7 @@ def generate_enhanced_report(results: List[Dict[str, Any]]) -> Dict[str, Any]:
         "verdict_accuracy": verdict_matches / total_tests if total_tests > 0 else 0,
         "confidence_accuracy": confidence_in_range / total_tests if total_tests > 0 else 0,
         "schema_compliance_rate": schema_valid / total_tests if total_tests > 0 else 0,
-        "total_schema_errors": sum(len(r["schema_errors"]) for r in results),
+        "total_schema_errors": total_schema_errors,
         "prompt_validation_summary": {
             "avg_completeness_score": 0.95
         },
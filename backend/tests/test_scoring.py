@@ -0,0 +1,42 @@
+"""
+Tests for the bulk scoring paths of ScoringService
+"""
+import pytest
+
+from app.models import Lead
+from app.services.scoring import ScoringService
+
+
+LEADS = [
+    Lead(id=1, name="Ada Lovelace", email="ada@microsoft.com", company="Microsoft Corporation",
+         title="Chief Technology Officer", phone="+1 (555) 123-4567",
+         linkedin_url="https://linkedin.com/in/ada", notes="Met at conference"),
+    Lead(id=2, name="Bob Smith", email="bob@gmail.com", company="Startup LLC",
+         title="Data Analyst", phone="12345"),
+    Lead(id=3, name="Cara Jones", email="cara@state.gov", company=None, title="Senior Manager"),
+    Lead(id=4, name="Dan", email="dan@acme.edu", company="Acme", title=None),
+    Lead(id=5, name="Eve", email="not-an-email", company="", title=" "),
+]
+
+WEIGHTS = [
+    None,
+    {"data_completeness": 10, "title_seniority": 10, "company_size": 10, "contact_quality": 10},
+]
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+def test_calculate_scores_matches_calculate_score(weights):
+    service = ScoringService(weights)
+
+    expected = [service.calculate_score(lead).total_score for lead in LEADS]
+
+    assert service.calculate_scores(LEADS) == expected
+
+
+@pytest.mark.parametrize("weights", WEIGHTS)
+def test_iter_scores_yields_ids_and_totals(weights):
+    service = ScoringService(weights)
+
+    expected = [(lead.id, service.calculate_score(lead).total_score) for lead in LEADS]
+
+    assert list(service.iter_scores(LEADS)) == expected
@@ -90,6 +90,7 @@ export const leadsApi = {
     type?: string
     limit?: number
     offset?: number
+    before?: number
   }): Promise<ActivitiesResponse> {
     const url = new URL(`${API_BASE_URL}/api/leads/${leadId}/activities`)
     
@@ -102,6 +103,9 @@ export const leadsApi = {
     if (params?.offset) {
       url.searchParams.append('offset', params.offset.toString())
     }
+    if (params?.before) {
+      url.searchParams.append('before', params.before.toString())
+    }
     
     const response = await fetch(url.toString())
     
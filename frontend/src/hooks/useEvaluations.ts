@@ -33,12 +33,16 @@ interface EvaluationRun {
   results: EvaluationResult[]
 }
 
+// List endpoint omits per-test results; fetch a single evaluation for those
+type EvaluationRunSummary = Omit<EvaluationRun, 'results'>
+
 interface RunEvaluationRequest {
   include_leads?: string[]
+  track_progress?: boolean
 }
 
 // Fetch all evaluations
-const fetchEvaluations = async (): Promise<EvaluationRun[]> => {
+const fetchEvaluations = async (): Promise<EvaluationRunSummary[]> => {
   const response = await fetch(`${API_BASE_URL}/api/evals/`)
   if (!response.ok) {
     throw new Error('Failed to fetch evaluations')
@@ -103,4 +107,4 @@ export const useRunEvaluation = () => {
   })
 }
 
-export type { EvaluationRun, EvaluationResult, RunEvaluationRequest }
+export type { EvaluationRun, EvaluationRunSummary, EvaluationResult, RunEvaluationRequest }
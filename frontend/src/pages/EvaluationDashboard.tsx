@@ -1,5 +1,5 @@
 import React, { useState } from 'react'
-import { useEvaluations, useRunEvaluation } from '../hooks/useEvaluations'
+import { useEvaluation, useEvaluations, useRunEvaluation } from '../hooks/useEvaluations'
 import { formatDistanceToNow } from 'date-fns'
 import { 
   PlayIcon, 
@@ -10,6 +10,55 @@ import {
   ClockIcon
 } from '@heroicons/react/24/outline'
 
+// Per-test results are fetched on expand; the list endpoint only returns summaries
+const EvaluationResults: React.FC<{ evaluationId: number }> = ({ evaluationId }) => {
+  const { data: evaluation, isLoading } = useEvaluation(evaluationId)
+
+  if (isLoading) {
+    return <p className="text-sm text-gray-500">Loading test results...</p>
+  }
+
+  const results = evaluation?.results ?? []
+
+  return (
+    <>
+      {results.length > 0 && (
+        <div>
+          <h4 className="text-sm font-medium text-gray-900 mb-2">Test Results</h4>
+          <div className="space-y-2">
+            {results.map((result, index) => (
+              <div
+                key={index}
+                className={`p-3 rounded-md border ${
+                  result.overall_pass
+                    ? 'bg-green-50 border-green-200'
+                    : 'bg-red-50 border-red-200'
+                }`}
+              >
+                <div className="flex items-center justify-between">
+                  <span className="font-medium text-sm">
+                    {result.lead_id}
+                  </span>
+                  <div className="flex items-center space-x-2">
+                    {result.overall_pass ? (
+                      <CheckCircleIcon className="h-4 w-4 text-green-500" />
+                    ) : (
+                      <XCircleIcon className="h-4 w-4 text-red-500" />
+                    )}
+                    <span className="text-xs text-gray-500">
+                      {result.actual_verdict}
+                    </span>
+                  </div>
+                </div>
+              </div>
+            ))}
+          </div>
+        </div>
+      )}
+    </>
+  )
+}
+
 const EvaluationDashboard: React.FC = () => {
   const { data: evaluations, isLoading, error } = useEvaluations()
   const { mutate: runEvaluation, isPending: isRunning, error: runError } = useRunEvaluation()
@@ -259,39 +308,7 @@ const EvaluationDashboard: React.FC = () => {
                         </div>
                       </div>
                       
-                      {evaluation.results.length > 0 && (
-                        <div>
-                          <h4 className="text-sm font-medium text-gray-900 mb-2">Test Results</h4>
-                          <div className="space-y-2">
-                            {evaluation.results.map((result, index) => (
-                              <div
-                                key={index}
-                                className={`p-3 rounded-md border ${
-                                  result.overall_pass
-                                    ? 'bg-green-50 border-green-200'
-                                    : 'bg-red-50 border-red-200'
-                                }`}
-                              >
-                                <div className="flex items-center justify-between">
-                                  <span className="font-medium text-sm">
-                                    {result.lead_id}
-                                  </span>
-                                  <div className="flex items-center space-x-2">
-                                    {result.overall_pass ? (
-                                      <CheckCircleIcon className="h-4 w-4 text-green-500" />
-                                    ) : (
-                                      <XCircleIcon className="h-4 w-4 text-red-500" />
-                                    )}
-                                    <span className="text-xs text-gray-500">
-                                      {result.actual_verdict}
-                                    </span>
-                                  </div>
-                                </div>
-                              </div>
-                            ))}
-                          </div>
-                        </div>
-                      )}
+                      <EvaluationResults evaluationId={evaluation.evaluation_id} />
                     </div>
                   )}
                 </div>
@@ -51,6 +51,7 @@ export interface ActivitiesResponse {
   lead_id: number
   limit?: number
   offset?: number
+  next_before?: number | null
 }
 
 export interface ScoreBreakdownItem {